@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+近重复标题检测：SimHash + 分段 LSH
+============================================================
+跨平台转载 (微博话题词原样出现在百度热搜等) 的标题往往只差一个
+话题符号、表情或标点，前缀截断的精确去重键拦不住，而不相关的
+长标题又可能恰好共享前缀被误杀。
+
+算法：
+1. 归一化：小写，去掉空白、标点、表情等非文字字符
+2. 特征：字符二元组 (bigram)，对中文短标题比分词更稳定，且无需加载词典
+3. 指纹：64 位 SimHash，每个特征哈希按位投票
+4. 检索：指纹切成 4 段 × 16 位建桶；汉明距离 ≤ 3 时按鸽巢原理
+   至少有一段完全相同，只需比较同桶候选，整体近似 O(N)
+"""
+
+import re
+import hashlib
+import functools
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+try:
+    import xxhash  # 可选: 非加密快速哈希，用于特征哈希
+except ImportError:
+    xxhash = None
+
+# ==================== 配置 ====================
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4                       # 分段数，须大于最大汉明距离
+SIMHASH_MAX_DISTANCE = 3                # 判定为近重复的最大汉明距离
+
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+# 非文字字符 (空白、标点、# 话题符号、表情等)
+_RE_NON_WORD = re.compile(r'[\W_]+')
+
+
+# ==================== SimHash ====================
+@functools.lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    """特征的 64 位哈希 (跨进程稳定，不受 PYTHONHASHSEED 影响)"""
+    data = feature.encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def _features(text: str) -> List[str]:
+    """归一化文本并切分为字符二元组 (单字符文本返回自身)"""
+    text = _RE_NON_WORD.sub('', text.lower())
+    if len(text) < 2:
+        return [text] if text else []
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+def simhash(text: str) -> int:
+    """计算文本的 64 位 SimHash 指纹"""
+    weights = [0] * SIMHASH_BITS
+    for feature in _features(text):
+        h = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    value = 0
+    for bit, w in enumerate(weights):
+        if w > 0:
+            value |= 1 << bit
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """两个指纹的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+# ==================== 分段索引 ====================
+class SimHashIndex:
+    """
+    SimHash 近重复索引
+
+    用法:
+        index = SimHashIndex()
+        if not index.has_near_dup(h):
+            index.add(h)
+    """
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE):
+        if max_distance >= SIMHASH_BANDS:
+            raise ValueError(f"max_distance 须小于分段数 {SIMHASH_BANDS}")
+        self.max_distance = max_distance
+        self._buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    @staticmethod
+    def _bands(value: int):
+        for i in range(SIMHASH_BANDS):
+            yield i, (value >> (i * _BAND_BITS)) & _BAND_MASK
+
+    def has_near_dup(self, value: int) -> bool:
+        """索引中是否存在汉明距离不超过阈值的指纹"""
+        for key in self._bands(value):
+            for other in self._buckets.get(key, ()):
+                if hamming_distance(value, other) <= self.max_distance:
+                    return True
+        return False
+
+    def add(self, value: int):
+        """加入指纹"""
+        for key in self._bands(value):
+            self._buckets[key].append(value)
+
+
+__all__ = [
+    'simhash', 'hamming_distance', 'SimHashIndex',
+    'SIMHASH_MAX_DISTANCE',
+]
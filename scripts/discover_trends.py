@@ -77,90 +77,192 @@
 """
 
 import os
+import re
 import sys
-import json
 import time
+import hashlib
+import asyncio
 import logging
+import argparse
 import traceback
 from datetime import datetime, timezone, timedelta
+from operator import itemgetter
+from itertools import takewhile
+from collections import Counter
 from pathlib import Path
 
 # 确保可以导入同目录模块
 sys.path.insert(0, str(Path(__file__).parent))
 
 from feed_crawler import CrawlOrchestrator, RawContent
-from trend_engine import TrendEngine
+from trend_engine import TrendEngine, enable_parallel_tokenize
+from fetch_news import main as run_fetch_news, ensure_dependencies as ensure_news_dependencies
+from fetch_news import json_loads, json_dumps, write_atomic
+
+# 依赖检查放在模块加载时执行一次：--loop 模式下新闻抓取在进程内调用，
+# jieba 词典与 HTTP 连接池在整个循环期间复用，而不是每轮重新启动解释器
+try:
+    import jieba
+except ImportError:
+    print("📦 安装 jieba 中文分词库...")
+    os.system(f"{sys.executable} -m pip install jieba -q")
+
+try:
+    import requests
+except ImportError:
+    print("📦 安装 requests...")
+    os.system(f"{sys.executable} -m pip install requests -q")
+
+try:
+    import ijson  # 可选: 流式解析 news.json，避免整份文档常驻内存
+except ImportError:
+    ijson = None
+
+try:
+    import xxhash  # 可选: 非加密快速哈希，用于生成趋势 ID
+except ImportError:
+    xxhash = None
 
 # ==================== 配置 ====================
 DATA_DIR = Path(__file__).parent.parent / "data"
 TRENDS_FILE = DATA_DIR / "trends.json"
 NEWS_FILE = DATA_DIR / "news.json"
 
+# 发现的趋势写入 news.json 时使用的来源标记
+DISCOVERED_SOURCE = '🔬 热点发现'
+
 # 日志配置
 logging.basicConfig(
     level=logging.INFO,
     format='%(message)s',
-    handlers=[logging.StreamHandler()]
+    handlers=[logging.StreamHandler(sys.stdout)]
 )
 logger = logging.getLogger('discover')
 
 
+# news.json 来源 → 平台名映射
+NEWS_PLATFORM_MAP = {
+    '抖音热搜': 'douyin',
+    '小红书热门': 'xiaohongshu', 
+    '今日头条': 'toutiao',
+    '36氪快讯': '36kr',
+    '新浪财经': 'sina',
+}
+_NEWS_PLATFORM_RE = re.compile('|'.join(map(re.escape, NEWS_PLATFORM_MAP)))
+
+def make_trend_id(keyword: str) -> str:
+    """根据关键词生成稳定的趋势 ID (优先 xxh64，回退 md5)"""
+    raw = keyword.encode('utf-8')
+    if xxhash is not None:
+        return f"trend_{xxhash.xxh64(raw).hexdigest()[:10]}"
+    return f"trend_{hashlib.md5(raw).hexdigest()[:10]}"
+
+
+def fingerprint_raw(raw_items) -> str:
+    """
+    计算本轮输入内容的指纹 (content_id + 热度/互动数)
+    
+    百度、微博等热榜的 content_id 由标题生成，标题不变而热度变化时
+    也必须视为新输入，否则会复用热力值已过时的趋势
+    """
+    raw = '\n'.join(f"{r.content_id}\t{r.views}\t{r.likes}\t{r.comments}\t{r.shares}"
+                    for r in raw_items).encode('utf-8')
+    if xxhash is not None:
+        return xxhash.xxh64(raw).hexdigest()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+# 解析 news.json 可能抛出的异常
+NEWS_PARSE_ERRORS = (ValueError, IOError) + ((ijson.JSONError,) if ijson else ())
+
+
+def iter_news_items(news_file):
+    """
+    逐条产出 news.json 中的新闻项
+    
+    安装了 ijson 时流式解析 items 数组，同一时刻只有一条新闻在内存中；
+    否则一次性读入并用 orjson / json 解析
+    """
+    if ijson is not None:
+        with open(news_file, 'rb') as f:
+            yield from ijson.items(f, 'items.item', use_float=True)
+        return
+    
+    data = json_loads(Path(news_file).read_bytes())
+    yield from data.get('items', [])
+
+
+# load_news_as_raw 读取的字段及缺省值 (summary 缺省时取标题)
+_NEWS_DEFAULTS = {
+    'title': '', 'source': '', 'summary': None, 'hot_value': 0, 'category': '',
+    'link': '', 'pub_date': '', 'fetch_time': '', 'lang': '', 'id': '',
+}
+_NEWS_FIELDS = itemgetter(*_NEWS_DEFAULTS)
+
+# load_news_as_raw 解析缓存: 路径 → (st_mtime_ns, RawContent 列表)
+_news_cache: dict = {}
+
+# 上一轮的输入指纹与词频统计 (--loop 模式下输入未变化时跳过关键词提取)
+_last_raw_hash = None
+_last_freq_stats: dict = {}
+
+
 def load_news_as_raw(news_file=None) -> list:
     """
     将 news.json 中的已抓取新闻转换为 RawContent 格式
     
     用途：即使爬虫全部失败，也能利用已有新闻数据做趋势分析
+    文件未修改 (mtime 不变) 时直接复用上次的解析结果
     """
     if news_file is None:
         news_file = NEWS_FILE
     
     items = []
     try:
-        if not Path(news_file).exists():
+        try:
+            mtime_ns = os.stat(news_file).st_mtime_ns
+        except FileNotFoundError:
             return items
         
-        with open(news_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        cache_key = str(news_file)
+        cached = _news_cache.get(cache_key)
+        if cached and cached[0] == mtime_ns:
+            logger.info(f"  📰 从 news.json 加载 {len(cached[1])} 条新闻作为补充数据 (未变化, 使用缓存)")
+            return list(cached[1])
         
-        news_list = data.get('items', [])
-        for n in news_list:
+        for n in iter_news_items(news_file):
             # 跳过之前发现的趋势（避免循环引用）
             if n.get('is_discovered_trend'):
                 continue
             
-            title = n.get('title', '').strip()
+            # 补齐缺失字段后一次性取出所需字段
+            (title, source, summary, hot_value, category,
+             link, pub_date, fetch_time, lang, news_id) = _NEWS_FIELDS({**_NEWS_DEFAULTS, **n})
+            
+            title = title.strip()
             if not title or len(title) < 4:
                 continue
             
-            source = n.get('source', '')
             # 映射到平台名
-            platform_map = {
-                '抖音热搜': 'douyin',
-                '小红书热门': 'xiaohongshu', 
-                '今日头条': 'toutiao',
-                '36氪快讯': '36kr',
-                '新浪财经': 'sina',
-            }
-            platform = 'news'
-            for key, val in platform_map.items():
-                if key in source:
-                    platform = val
-                    break
+            m = _NEWS_PLATFORM_RE.search(source)
+            platform = NEWS_PLATFORM_MAP[m.group(0)] if m else 'news'
             
             items.append(RawContent(
                 platform=platform,
-                content_id=f"news_{n.get('id', '')}",
+                content_id=f"news_{news_id}",
                 title=title,
-                text=n.get('summary', title),
-                views=n.get('hot_value', 0) or 0,
-                tags=[n.get('category', '')],
-                url=n.get('link', ''),
-                pub_time=n.get('pub_date', ''),
-                crawl_time=n.get('fetch_time', ''),
+                text=title if summary is None else summary,
+                views=hot_value or 0,
+                tags=[category],
+                url=link,
+                pub_time=pub_date,
+                crawl_time=fetch_time,
                 content_type='article',
-                extra={'source': source, 'lang': n.get('lang', '')}
+                extra={'source': source, 'lang': lang}
             ))
         
+        _news_cache[cache_key] = (mtime_ns, items)
+        items = list(items)
         logger.info(f"  📰 从 news.json 加载 {len(items)} 条新闻作为补充数据")
     except Exception as e:
         logger.error(f"  ⚠️ 加载 news.json 失败: {str(e)[:60]}")
@@ -178,35 +280,49 @@ def discover_trends(platforms=None, keyword_count=10, topK=50, proxy=None):
     4. 突发检测
     5. 热力值计算
     6. 输出趋势排名
+    
+    若采集结果与上一轮完全相同 (常见于平台限流返回缓存数据)，
+    跳过关键词提取，复用上一轮的词频统计；时间序列、突发检测和热力值仍按本轮重新计算
     """
+    global _last_raw_hash, _last_freq_stats
     start_time = time.time()
     
-    print(f"\n{'='*60}")
-    print(f"🔬 热点发现系统 v2.0")
-    print(f"   时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"   平台: {', '.join(platforms) if platforms else '全部'}")
-    print(f"{'='*60}")
+    logger.info('\n'.join([
+        f"\n{'='*60}",
+        f"🔬 热点发现系统 v2.0",
+        f"   时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"   平台: {', '.join(platforms) if platforms else '全部'}",
+        f"{'='*60}",
+    ]))
     
-    # ── 阶段1: 数据采集 ──
+    # ── 阶段1: 数据采集 (多平台并发) ──
     orchestrator = CrawlOrchestrator(proxy=proxy)
-    raw_items = orchestrator.crawl_all(
+    raw_items = asyncio.run(orchestrator.crawl_all_async(
         platforms=platforms,
         keyword_count=keyword_count
-    )
+    ))
     
     # ── 阶段1.5: 补充已有新闻数据 ──
     news_items = load_news_as_raw()
     if news_items:
         raw_items.extend(news_items)
-        print(f"  📊 爬虫 {len(raw_items) - len(news_items)} 条 + 新闻 {len(news_items)} 条 = 总计 {len(raw_items)} 条")
+        logger.info(f"  📊 爬虫 {len(raw_items) - len(news_items)} 条 + 新闻 {len(news_items)} 条 = 总计 {len(raw_items)} 条")
     
     if not raw_items:
-        print("\n⚠️ 未采集到任何数据，请先运行 python3 scripts/fetch_news.py")
+        logger.warning("\n⚠️ 未采集到任何数据，请先运行 python3 scripts/fetch_news.py")
         return []
     
     # ── 阶段2: 趋势分析 ──
     engine = TrendEngine()
-    trends = engine.process(raw_items, topK=topK)
+    raw_hash = fingerprint_raw(raw_items)
+    if raw_hash == _last_raw_hash:
+        logger.info(f"\n🔁 输入未变化 ({len(raw_items)} 条)，复用上一轮关键词统计")
+        freq_stats = _last_freq_stats
+    else:
+        logger.info(f"\n🔬 趋势分析引擎启动 [{len(raw_items)} 条内容]")
+        freq_stats = engine.extract_stats(raw_items)
+    # 即使输入未变化也记录本窗口计数并重新打分，历史序列不缺窗口，热力值按当前时间衰减
+    trends = engine.rank(freq_stats, topK=topK)
     
     # ── 阶段3: 保存结果 ──
     engine.save_trends(trends, TRENDS_FILE)
@@ -214,130 +330,149 @@ def discover_trends(platforms=None, keyword_count=10, topK=50, proxy=None):
     # ── 阶段4: 合并到新闻数据 ──
     merge_trends_to_news(trends)
     
+    _last_raw_hash, _last_freq_stats = raw_hash, freq_stats
+    
     elapsed = time.time() - start_time
     
-    # 输出摘要
-    print(f"\n{'='*60}")
-    print(f"✅ 热点发现完成 ({elapsed:.1f}s)")
-    print(f"   采集内容: {len(raw_items)} 条")
-    print(f"   发现趋势: {len(trends)} 个")
-    print(f"   突发热点: {sum(1 for t in trends if t.is_burst)} 个")
-    print(f"   上升趋势: {sum(1 for t in trends if t.trend_direction in ('↑','↗'))} 个")
-    print(f"{'='*60}")
+    # 输出摘要 (合并为一条日志，减少终端写入次数)
+    lines = [
+        f"\n{'='*60}",
+        f"✅ 热点发现完成 ({elapsed:.1f}s)",
+        f"   采集内容: {len(raw_items)} 条",
+        f"   发现趋势: {len(trends)} 个",
+        f"   突发热点: {sum(1 for t in trends if t.is_burst)} 个",
+        f"   上升趋势: {sum(1 for t in trends if t.trend_direction in ('↑','↗'))} 个",
+        f"{'='*60}",
+    ]
     
     if trends:
-        print(f"\n🏆 Top 10 热点:")
+        lines.append(f"\n🏆 Top 10 热点:")
         for i, t in enumerate(trends[:10]):
             burst = '🔴 BURST' if t.is_burst else ''
             direction = t.trend_direction
             platforms = ','.join(t.platforms[:3])
-            print(f"   {i+1:2d}. [{t.heat_score:5.1f}] {direction} {t.keyword:12s} "
-                  f"| freq={t.frequency:3d} | {platforms:20s} {burst}")
+            lines.append(f"   {i+1:2d}. [{t.heat_score:5.1f}] {direction} {t.keyword:12s} "
+                         f"| freq={t.frequency:3d} | {platforms:20s} {burst}")
+    
+    logger.info('\n'.join(lines))
     
     return trends
 
 
+def build_trend_item(trend, now_iso):
+    """将单个趋势转换为 news.json 中的新闻项"""
+    # 构建摘要
+    parts = []
+    if trend.is_burst:
+        parts.append('⚡ 突发热点')
+    parts.append(f'🔥 热力值: {trend.heat_score:.0f}')
+    parts.append(f'📊 频率: {trend.frequency}')
+    if trend.platforms:
+        parts.append(f'📱 {",".join(trend.platforms[:3])}')
+    if trend.macd_signal == 'bullish':
+        parts.append('📈 趋势上升')
+    if trend.related_titles:
+        parts.append(f'相关: {trend.related_titles[0][:50]}')
+    
+    importance = 3
+    if trend.is_burst:
+        importance = 5
+    elif trend.heat_score >= 60:
+        importance = 4
+    elif trend.heat_score >= 30:
+        importance = 3
+    
+    return {
+        'id': make_trend_id(trend.keyword),
+        'title': f"{trend.trend_direction} {trend.keyword}",
+        'summary': ' · '.join(parts),
+        'link': '',
+        'source': DISCOVERED_SOURCE,
+        'source_icon': '🔬',
+        'category': trend.category or '时事',
+        'lang': 'zh',
+        'image': '',
+        'pub_date': trend.peak_time or now_iso,
+        'fetch_time': now_iso,
+        'importance': importance,
+        'regions': [],
+        'priority': 0,  # 高优先级
+        'hot_value': int(trend.heat_score * 1000),
+        'is_discovered_trend': True,
+        'trend_data': {
+            'heat_score': trend.heat_score,
+            'frequency': trend.frequency,
+            'acceleration': trend.acceleration,
+            'is_burst': trend.is_burst,
+            'z_score': trend.burst_z_score,
+            'macd_signal': trend.macd_signal,
+            'direction': trend.trend_direction,
+            'platforms': trend.platforms,
+            'sparkline': trend.sparkline[-20:],
+        }
+    }
+
+
 def merge_trends_to_news(trends):
     """
     将发现的趋势合并到 news.json 中
     
     趋势会作为特殊的新闻项出现在列表中，
-    标记 source='热点发现' 以区分常规新闻
+    标记 source=DISCOVERED_SOURCE 以区分常规新闻
     """
     if not trends:
         return
     
-    # 加载现有新闻
+    # 读取前的 mtime：load_news_as_raw 的缓存若对应这一版文件，写回后可续用
+    try:
+        prev_mtime_ns = os.stat(NEWS_FILE).st_mtime_ns
+    except OSError:
+        prev_mtime_ns = None
+    
+    # 加载现有新闻，并在同一遍中统计来源
     news_items = []
-    if NEWS_FILE.exists():
-        try:
-            with open(NEWS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                news_items = data.get('items', [])
-        except (json.JSONDecodeError, IOError):
-            pass
-    
-    # 移除旧的发现趋势
-    news_items = [n for n in news_items if n.get('source') != '🔬 热点发现']
-    
-    # 添加新趋势
-    for trend in trends[:30]:  # 最多30个
-        if trend.heat_score < 10:
-            continue  # 过滤低热度
-        
-        # 构建摘要
-        parts = []
-        if trend.is_burst:
-            parts.append('⚡ 突发热点')
-        parts.append(f'🔥 热力值: {trend.heat_score:.0f}')
-        parts.append(f'📊 频率: {trend.frequency}')
-        if trend.platforms:
-            parts.append(f'📱 {",".join(trend.platforms[:3])}')
-        if trend.macd_signal == 'bullish':
-            parts.append('📈 趋势上升')
-        if trend.related_titles:
-            parts.append(f'相关: {trend.related_titles[0][:50]}')
-        
-        importance = 3
-        if trend.is_burst:
-            importance = 5
-        elif trend.heat_score >= 60:
-            importance = 4
-        elif trend.heat_score >= 30:
-            importance = 3
-        
-        import hashlib
-        news_item = {
-            'id': f"trend_{hashlib.md5(trend.keyword.encode()).hexdigest()[:10]}",
-            'title': f"{trend.trend_direction} {trend.keyword}",
-            'summary': ' · '.join(parts),
-            'link': '',
-            'source': '🔬 热点发现',
-            'source_icon': '🔬',
-            'category': trend.category or '时事',
-            'lang': 'zh',
-            'image': '',
-            'pub_date': trend.peak_time or datetime.now(timezone.utc).isoformat(),
-            'fetch_time': datetime.now(timezone.utc).isoformat(),
-            'importance': importance,
-            'regions': [],
-            'priority': 0,  # 高优先级
-            'hot_value': int(trend.heat_score * 1000),
-            'is_discovered_trend': True,
-            'trend_data': {
-                'heat_score': trend.heat_score,
-                'frequency': trend.frequency,
-                'acceleration': trend.acceleration,
-                'is_burst': trend.is_burst,
-                'z_score': trend.burst_z_score,
-                'macd_signal': trend.macd_signal,
-                'direction': trend.trend_direction,
-                'platforms': trend.platforms,
-                'sparkline': trend.sparkline[-20:],
-            }
-        }
-        news_items.append(news_item)
+    source_counter = Counter()
+    try:
+        # 解析时直接移除旧的发现趋势 (文件不存在时 OSError 也在此吞掉)
+        for n in iter_news_items(NEWS_FILE):
+            source = n.get('source', '')
+            if source != DISCOVERED_SOURCE:
+                news_items.append(n)
+                source_counter[source] += 1
+    except NEWS_PARSE_ERRORS:
+        pass
+    
+    # 添加新趋势 (同一批趋势共用一个秒级时间戳)
+    now_iso = datetime.fromtimestamp(time.time(), tz=timezone.utc).isoformat(timespec='seconds')
+    # trends 已按热力值降序排列，遇到第一个低热度趋势即可停止
+    eligible = takewhile(lambda t: t.heat_score >= 10, trends[:30])  # 最多30个, 过滤低热度
+    new_items = [build_trend_item(t, now_iso) for t in eligible]
+    news_items.extend(new_items)
+    source_counter[DISCOVERED_SOURCE] += len(new_items)
     
     # 保存
     output = {
-        'last_update': datetime.now(timezone.utc).isoformat(),
+        'last_update': now_iso,
         'total': len(news_items),
-        'sources': len(set(n.get('source', '') for n in news_items)),
+        'sources': sum(1 for c in source_counter.values() if c),
         'items': news_items
     }
     
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with open(NEWS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    write_atomic(NEWS_FILE, json_dumps(output, indent=True))
     
-    trend_count = sum(1 for n in news_items if n.get('is_discovered_trend'))
-    print(f"  📰 已合并 {trend_count} 个趋势到新闻数据")
+    # 这里只替换发现趋势，普通新闻原样写回，而 load_news_as_raw 本就跳过发现趋势，
+    # 其缓存内容仍然有效：改按新的 mtime 记录，--loop 下一轮才能命中
+    cache_key = str(NEWS_FILE)
+    cached = _news_cache.get(cache_key)
+    if cached and cached[0] == prev_mtime_ns:
+        _news_cache[cache_key] = (os.stat(NEWS_FILE).st_mtime_ns, cached[1])
+    
+    logger.info(f"  📰 已合并 {len(new_items)} 个趋势到新闻数据")
 
 
 # ==================== CLI 入口 ====================
 if __name__ == '__main__':
-    import argparse
-    
     parser = argparse.ArgumentParser(
         description='🔬 抖音/小红书 实时热点发现系统',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -385,18 +520,13 @@ if __name__ == '__main__':
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # 安装依赖
-    try:
-        import jieba
-    except ImportError:
-        print("📦 安装 jieba 中文分词库...")
-        os.system(f"{sys.executable} -m pip install jieba -q")
+    # 多核机器上启用 jieba 并行分词
+    cpu_count = os.cpu_count() or 1
+    if cpu_count > 1:
+        enable_parallel_tokenize(min(4, cpu_count))
     
-    try:
-        import requests
-    except ImportError:
-        print("📦 安装 requests...")
-        os.system(f"{sys.executable} -m pip install requests -q")
+    if args.with_news:
+        ensure_news_dependencies()
     
     # 解析平台参数（默认只用可靠平台）
     platforms = None
@@ -420,7 +550,7 @@ if __name__ == '__main__':
                 # 同时运行新闻抓取
                 if args.with_news:
                     print("\n📰 运行新闻抓取...")
-                    os.system(f"{sys.executable} {Path(__file__).parent / 'fetch_news.py'}")
+                    run_fetch_news()
                 
                 next_run = (datetime.now() + timedelta(minutes=args.loop)).strftime('%H:%M:%S')
                 print(f"\n⏰ 下次运行: {next_run}")
@@ -443,6 +573,11 @@ if __name__ == '__main__':
         
         if args.with_news:
             print("\n📰 运行新闻抓取...")
-            os.system(f"{sys.executable} {Path(__file__).parent / 'fetch_news.py'}")
+            # 进程内调用，新闻抓取失败不影响已写出的趋势结果
+            try:
+                run_fetch_news()
+            except Exception as e:
+                print(f"\n❌ 新闻抓取出错: {e}")
+                traceback.print_exc()
         
         print("\n✅ 完成!")
@@ -20,23 +20,212 @@
 - 随机延迟 jitter (模拟人类行为)
 """
 
+import io
 import json
 import os
 import re
+import sys
 import time
+import asyncio
 import random
 import hashlib
+import threading
 import logging
+import functools
+import itertools
+import statistics
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from collections import defaultdict, deque
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, field, asdict
+from urllib.parse import urlparse, quote, unquote
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass, field
+
+from dedup import simhash, SimHashIndex
+
+try:
+    import orjson  # 可选: C 实现的 JSON 解析，SSR 数据块解析更快
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash  # 可选: 非加密快速哈希，用于生成内容 ID
+except ImportError:
+    xxhash = None
+
+try:
+    import ijson  # 可选: 流式解析体积较大的接口响应，只为用到的条目建对象
+except ImportError:
+    ijson = None
+
+try:
+    import brotli  # 可选: 安装后 urllib3 可解码 br 压缩响应
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    from selectolax.parser import HTMLParser  # 可选: C 实现的 HTML 解析，降级提取标题时替代正则
+except ImportError:
+    HTMLParser = None
 
 # ==================== 日志配置 ====================
 logger = logging.getLogger('feed_crawler')
 
+# ==================== 工具函数 ====================
+def _json_loads(raw):
+    """解析 JSON 文本或字节串 (优先 orjson)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_default(obj):
+    """标准库 json 的兜底序列化: RawContent 转为字典"""
+    if isinstance(obj, RawContent):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """
+    序列化为 UTF-8 JSON 字节串 (优先 orjson)
+    
+    可直接包含 RawContent: orjson 原生序列化 dataclass，
+    不经过 to_dict 的中间字典
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None,
+                      default=_json_default).encode()
+
+
+@functools.lru_cache(maxsize=1024)
+def _domain_of(url: str) -> str:
+    """提取 URL 的域名 (同一 URL 重复请求/重试时直接命中缓存)"""
+    return urlparse(url).netloc
+
+
+def _parse_retry_after(value: str, cap: float) -> Optional[float]:
+    """
+    解析 Retry-After 头，返回等待秒数 (截断到 [0, cap])
+    
+    支持秒数和 HTTP-date 两种格式，无法解析时返回 None
+    """
+    value = value.strip()
+    if value.isdigit():
+        return min(int(value), cap)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    delta = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(delta, 0.0), cap)
+
+
+@functools.lru_cache(maxsize=1024)
+def _quote_kw(keyword: str) -> str:
+    """URL 编码关键词 (同一关键词在各平台/各接口间只编码一次)"""
+    return quote(keyword, safe='')
+
+
+def _response_text(resp) -> str:
+    """
+    解码 HTML 响应正文
+    
+    未声明 charset 时按 UTF-8 解码 (这些站点均为 UTF-8)，
+    避免 requests 回退到 ISO-8859-1 或 chardet 编码探测
+    """
+    if 'charset' not in resp.headers.get('Content-Type', '').lower():
+        resp.encoding = 'utf-8'
+    return resp.text
+
+
+def _short_hash(text: str) -> str:
+    """生成 10 位十六进制内容 ID (非加密用途，优先 xxhash)"""
+    data = text.encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)[:10]
+    # digest_size=5 正好输出 10 位十六进制，无需截断
+    return hashlib.blake2b(data, digest_size=5).hexdigest()
+
+
+# 中文计数单位
+_CN_UNITS = {'万': 10_000, '亿': 100_000_000}
+
+
+def _parse_cn_count(s: str) -> int:
+    """解析带中文单位的计数，如 "1.2万" → 12000、"3亿+" → 300000000，无法解析时返回 0"""
+    s = s.strip().rstrip('+')
+    unit = _CN_UNITS.get(s[-1:], 1)
+    if unit != 1:
+        s = s[:-1]
+    try:
+        return int(float(s) * unit) if unit != 1 else int(s)
+    except ValueError:
+        return 0
+
+
+# 去重键中需要去掉的空白 (含全角空格)
+_DEDUP_TABLE = str.maketrans('', '', ' \t\u3000')
+
+
+def _dedup_key(title: str) -> str:
+    """标题去重键: 前 30 字符、小写、去空白"""
+    return title[:30].lower().translate(_DEDUP_TABLE)
+
+
+# ==================== 页面解析正则 (模块加载时编译一次) ====================
+_RE_RENDER_DATA = re.compile(r'<script\s+id="RENDER_DATA"[^>]*>(.+?)</script>', re.DOTALL)
+_RE_INITIAL_STATE = re.compile(r'window\.__INITIAL_STATE__\s*=\s*(.+?)</script>', re.DOTALL)
+_RE_ANCHOR_TITLE = re.compile(r'<a[^>]*title="([^"]{5,})"[^>]*>')
+_RE_XHS_TITLE = re.compile(r'<a[^>]*class="[^"]*title[^"]*"[^>]*>([^<]{5,})</a>')
+# 字节串模式: 直接匹配响应原始字节，省去整页解码
+_RE_BAIDU_SDATA = re.compile(rb'<!--s-data:(.*?)-->', re.DOTALL)
+
+
+def _extract_anchor_titles(html: str) -> List[str]:
+    """提取页面中 <a title="..."> 的标题 (至少 5 个字符)"""
+    if HTMLParser is None:
+        return _RE_ANCHOR_TITLE.findall(html)
+    titles = []
+    for node in HTMLParser(html).css('a[title]'):
+        title = node.attributes.get('title') or ''
+        if len(title) >= 5:
+            titles.append(title)
+    return titles
+
+
+def _extract_xhs_titles(html: str) -> List[str]:
+    """提取小红书页面中 class 含 title 的 <a> 文本 (至少 5 个字符)"""
+    if HTMLParser is None:
+        return _RE_XHS_TITLE.findall(html)
+    titles = []
+    for node in HTMLParser(html).css('a[class*="title"]'):
+        title = node.text(deep=True)
+        if len(title) >= 5:
+            titles.append(title)
+    return titles
+
+
 # ==================== 数据结构 ====================
-@dataclass
+# 高频出现的平台/内容类型字符串，驻留后所有 RawContent 共享同一对象
+_DOUYIN = sys.intern('douyin')
+_XHS = sys.intern('xiaohongshu')
+_VIDEO = sys.intern('video')
+_NOTE = sys.intern('note')
+
+# Python 3.10+ 使用 __slots__，减少大量 RawContent 实例的内存占用
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class RawContent:
     """采集到的原始内容"""
     platform: str           # 来源平台: douyin / xiaohongshu / weibo / zhihu / bilibili
@@ -60,12 +249,29 @@ class RawContent:
         return self.likes * 1.0 + self.comments * 3.0 + self.shares * 5.0 + self.views * 0.01
 
     def to_dict(self):
-        return asdict(self)
+        # 字段都是标量或扁平容器，手写比 asdict 的递归深拷贝快得多
+        return {
+            'platform': self.platform,
+            'content_id': self.content_id,
+            'title': self.title,
+            'text': self.text,
+            'author': self.author,
+            'likes': self.likes,
+            'comments': self.comments,
+            'shares': self.shares,
+            'views': self.views,
+            'tags': list(self.tags),
+            'url': self.url,
+            'pub_time': self.pub_time,
+            'crawl_time': self.crawl_time,
+            'content_type': self.content_type,
+            'extra': dict(self.extra),
+        }
 
 
 # ==================== 反爬基础设施 ====================
 # 50+ 真实浏览器 User-Agent 池
-UA_POOL = [
+UA_POOL = (
     # Chrome macOS
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -92,7 +298,7 @@ UA_POOL = [
     'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Mobile Safari/537.36',
     'Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36',
     'Mozilla/5.0 (iPad; CPU OS 17_3 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1',
-]
+)
 
 # 种子关键词库（按领域分组，每次随机抽样）
 SEED_KEYWORDS = {
@@ -120,75 +326,312 @@ SEED_KEYWORDS = {
     ],
 }
 
+# 全部种子关键词（展平一次，供各平台随机抽样）
+ALL_SEED_KEYWORDS = tuple(w for words in SEED_KEYWORDS.values() for w in words)
+
+
+@dataclass
+class _DomainState:
+    """单个域名的限流状态"""
+    rate: float                             # 令牌生成速率 (请求/秒)
+    base_rate: float                        # 基础速率，自适应调整的上下限以此为准
+    capacity: float                         # 令牌桶容量 (允许的突发请求数)
+    tokens: float = 1.0                     # 当前令牌数 (负数表示已预约的欠额)
+    last_refill: float = field(default_factory=time.monotonic)  # 上次补充令牌的时刻
+    blocked_reason: Optional[str] = None    # 封禁原因 (None = 未封禁)
+    fail_count: int = 0                     # 连续失败次数
+
 
 class RateLimiter:
     """
-    令牌桶限流器
+    自适应令牌桶限流器 (Adaptive Token Bucket)
     
     控制每个域名的请求频率，防止触发反爬。
-    支持自适应降速：遇到429/403时自动扩大间隔。
+    - 每个域名一个令牌桶，按 rate 生成令牌，最多积累 capacity 个
+    - 请求成功：速率加性放大 rate ×(1+increase)，上限为基础速率的 2 倍
+    - 429/403/412：速率乘性收缩 rate ×decrease，下限为基础速率的 1/5，
+      并清空令牌；有 Retry-After 时令牌欠额恰好等于等待时间
     支持域名封禁：永久403/401自动标记，跳过后续请求。
+    线程安全：多个线程并发请求时，在锁内扣减令牌 (不足时记为欠额) 预约发送时刻，
+    锁外睡眠，同域名请求仍按速率排队，不同域名互不阻塞。
+    并发上限：每个域名同时在途的请求数不超过 per_host (host_slot)。
+    按域名配置：host_limits 为 {域名: (速率, 突发容量)}，配置过的域名令牌桶初始为满，
+    开头的一批请求可以连续发出；未配置的域名使用默认速率与容量。
     """
-    def __init__(self, default_interval: float = 3.0, jitter: float = 2.0):
-        self.default_interval = default_interval
+    def __init__(self, default_interval: float = 3.0, jitter: float = 2.0,
+                 capacity: float = 2.0, increase: float = 0.1, decrease: float = 0.5,
+                 per_host: int = 3, host_limits: Dict[str, Tuple[float, float]] = None):
         self.jitter = jitter
-        self._last_request: Dict[str, float] = {}
-        self._penalties: Dict[str, float] = {}  # 域名惩罚倍数
-        self._blocked: Dict[str, str] = {}  # 域名 → 封禁原因
-        self._fail_count: Dict[str, int] = {}  # 域名连续失败次数
+        self.per_host = per_host
+        self.capacity = capacity
+        self.increase = increase
+        self.decrease = decrease
+        self.base_rate = 1.0 / default_interval
+        self.host_limits = dict(host_limits or {})
+        self._lock = threading.Lock()
+        self._state: Dict[str, _DomainState] = {}  # 域名 → 限流状态
+        self._slots: Dict[str, threading.BoundedSemaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(self.per_host))  # 域名 → 在途请求名额
 
     def is_blocked(self, domain: str) -> bool:
         """检查域名是否已被标记为不可用"""
-        return domain in self._blocked
+        st = self._state.get(domain)
+        return st is not None and st.blocked_reason is not None
+
+    def blocked_domains(self) -> frozenset:
+        """当前已标记为不可用的域名快照"""
+        with self._lock:
+            return frozenset(d for d, st in self._state.items() if st.blocked_reason is not None)
+
+    def _get_state(self, domain: str) -> _DomainState:
+        """获取域名的限流状态，首次访问时按配置创建 (调用方持有锁)"""
+        st = self._state.get(domain)
+        if st is None:
+            limit = self.host_limits.get(domain)
+            if limit:
+                rate, capacity = limit
+                st = _DomainState(rate=rate, base_rate=rate, capacity=capacity, tokens=capacity)
+            else:
+                st = _DomainState(rate=self.base_rate, base_rate=self.base_rate,
+                                  capacity=self.capacity)
+            self._state[domain] = st
+        return st
 
     def block(self, domain: str, reason: str = 'unknown'):
         """标记域名为不可用（本次运行期间跳过所有请求）"""
-        if domain not in self._blocked:
-            self._blocked[domain] = reason
-            logger.warning(f"  🚫 {domain} 已标记为不可用: {reason}")
+        with self._lock:
+            st = self._get_state(domain)
+            if st.blocked_reason is not None:
+                return
+            st.blocked_reason = reason
+        logger.warning(f"  🚫 {domain} 已标记为不可用: {reason}")
 
     def record_fail(self, domain: str) -> int:
         """记录连续失败次数，返回当前次数"""
-        self._fail_count[domain] = self._fail_count.get(domain, 0) + 1
-        return self._fail_count[domain]
+        with self._lock:
+            st = self._get_state(domain)
+            st.fail_count += 1
+            return st.fail_count
 
     def reset_fail(self, domain: str):
         """重置连续失败计数"""
-        self._fail_count[domain] = 0
+        with self._lock:
+            self._get_state(domain).fail_count = 0
+
+    def host_slot(self, domain: str) -> threading.BoundedSemaphore:
+        """
+        获取域名的在途请求名额，用法: with rate_limiter.host_slot(domain): ...
+        
+        名额用尽时阻塞，直到同域名的其他请求完成
+        """
+        with self._lock:
+            return self._slots[domain]
+
+    def _refill(self, st: _DomainState, now: float):
+        """按流逝时间补充令牌 (调用方持有锁)"""
+        st.tokens = min(st.capacity, st.tokens + (now - st.last_refill) * st.rate)
+        st.last_refill = now
 
     def wait(self, domain: str):
         """等待直到可以发送下一个请求"""
-        if self.is_blocked(domain):
-            return  # 被封禁的域名不等待，直接跳过
-        
-        now = time.time()
-        penalty = self._penalties.get(domain, 1.0)
-        interval = self.default_interval * penalty + random.uniform(0, self.jitter)
-        
-        last = self._last_request.get(domain, 0)
-        elapsed = now - last
+        # 锁内只扣减令牌并算出需要等待的时间，睡眠放在锁外
+        with self._lock:
+            st = self._get_state(domain)
+            if st.blocked_reason is not None:
+                return  # 被封禁的域名不等待，直接跳过
+            
+            # 单调时钟不受系统校时影响
+            self._refill(st, time.monotonic())
+            st.tokens -= 1
+            sleep_time = -st.tokens / st.rate if st.tokens < 0 else 0.0
         
-        if elapsed < interval:
-            sleep_time = interval - elapsed
+        if sleep_time > 0:
+            sleep_time += random.uniform(0, self.jitter)
             logger.debug(f"  ⏳ 限流等待 {sleep_time:.1f}s ({domain})")
             time.sleep(sleep_time)
+
+    def increase_rate(self, domain: str):
+        """请求成功：加性提高令牌生成速率 (上限为基础速率的 2 倍)"""
+        with self._lock:
+            st = self._get_state(domain)
+            self._refill(st, time.monotonic())
+            st.rate = min(st.base_rate * 2, st.rate * (1 + self.increase))
+
+    def decrease_rate(self, domain: str, retry_after: float = None, factor: float = None):
+        """
+        被限流：乘性降低令牌生成速率并清空令牌
         
-        self._last_request[domain] = time.time()
+        Args:
+            retry_after: 服务端要求 (或退避计算) 的等待秒数，下一个请求恰好在此之后发出
+            factor: 速率收缩系数，默认 self.decrease
+        """
+        with self._lock:
+            st = self._get_state(domain)
+            self._refill(st, time.monotonic())
+            st.rate = max(st.base_rate / 5, st.rate * (factor or self.decrease))
+            # 下一次 wait 扣减 1 个令牌后，欠额恰好需要 retry_after 秒补齐
+            st.tokens = 1 - retry_after * st.rate if retry_after else 0.0
+            rate = st.rate
+        logger.warning(f"  ⚠️ {domain} 降速 → {rate:.2f} 请求/秒")
+
+    def defer(self, domain: str, seconds: float):
+        """推迟域名的下一次请求 (不改变速率)，由下一次 wait 负责等待"""
+        with self._lock:
+            st = self._get_state(domain)
+            self._refill(st, time.monotonic())
+            st.tokens = min(st.tokens, 1 - seconds * st.rate)
+
+
+# 按域名的限流配置: 域名 → (请求/秒, 突发容量)
+# 热榜/开放接口可以放宽，抖音/小红书等风控严格的域名使用默认值
+HOST_RATE_LIMITS = {
+    'weibo.com': (2.0, 5),
+    'api.bilibili.com': (5.0, 10),
+    'top.baidu.com': (1.0, 3),
+}
 
-    def penalize(self, domain: str, factor: float = 2.0):
-        """对某域名施加惩罚（降速）"""
-        current = self._penalties.get(domain, 1.0)
-        self._penalties[domain] = min(current * factor, 5.0)  # 最多5倍
-        logger.warning(f"  ⚠️ {domain} 降速 → 间隔×{self._penalties[domain]:.1f}")
+# 全局限流器
+rate_limiter = RateLimiter(default_interval=2.5, jitter=2.0, host_limits=HOST_RATE_LIMITS)
 
-    def reset_penalty(self, domain: str):
-        """重置惩罚"""
-        if domain in self._penalties:
-            self._penalties[domain] = max(1.0, self._penalties[domain] * 0.5)
+# 共享 Session 的连接池配置 (urllib3 默认均为 10)
+SESSION_POOL_HOSTS = 32   # 缓存连接池的域名数
+SESSION_POOL_SIZE = 64    # 每个域名保留的长连接数
 
+# 只有装了 brotli 才声明接受 br，否则服务端返回的 br 正文无法解码
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
 
-# 全局限流器
-rate_limiter = RateLimiter(default_interval=2.5, jitter=2.0)
+# 代理地址 → 共享 Session
+_sessions: Dict[Optional[str], object] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(proxy: str = None):
+    """
+    获取共享的 requests.Session（按代理区分）
+    
+    所有平台爬虫共用同一个连接池，重叠的域名 (CDN 等) 复用 TCP/TLS 连接；
+    平台差异 (Referer / User-Agent) 随每次请求的 headers 发送。
+    """
+    with _sessions_lock:
+        session = _sessions.get(proxy)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            session = requests.Session()
+            
+            # 放大连接池并保持长连接，同一域名的后续请求复用已建立的连接
+            # 重试由 safe_request 自行处理，适配器层不重试
+            adapter = HTTPAdapter(pool_connections=SESSION_POOL_HOSTS,
+                                  pool_maxsize=SESSION_POOL_SIZE,
+                                  max_retries=Retry(total=0, read=False))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            
+            # 基础 headers
+            session.headers.update({
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+                'Accept-Encoding': ACCEPT_ENCODING,
+                'Connection': 'keep-alive',
+                'Cache-Control': 'no-cache',
+            })
+            
+            if proxy:
+                session.proxies = {'http': proxy, 'https': proxy}
+            _sessions[proxy] = session
+        return session
+
+
+# 响应缓存有效期 (秒)，按内容类型区分
+RESPONSE_CACHE_TTL = {
+    'realtime': 30,    # 热榜
+    'topic': 300,      # 话题 Feed
+}
+# 超过该时长未使用的缓存条目在加载时丢弃
+RESPONSE_CACHE_MAX_AGE = 24 * 3600
+
+
+class ResponseCache:
+    """
+    热榜接口的解析结果缓存 (磁盘持久化)
+    
+    按 URL 保存 ETag / Last-Modified 与解析后的内容列表：
+    - TTL 内直接复用，不发请求
+    - TTL 过期后发条件请求，304 时复用上次解析结果，省去下载和 JSON 解析
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+    
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            entries = {}
+            try:
+                entries = _json_loads(self.path.read_bytes())
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.debug(f"  ⚠️ 响应缓存损坏，已忽略: {str(e)[:60]}")
+            cutoff = time.time() - RESPONSE_CACHE_MAX_AGE
+            self._entries = {url: e for url, e in entries.items() if e.get('time', 0) >= cutoff}
+        return self._entries
+    
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_bytes(_json_dumps(self._entries))
+        os.replace(tmp, self.path)
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """返回缓存条目 {'etag', 'last_modified', 'time', 'items'}，不存在时返回 None"""
+        with self._lock:
+            return self._load().get(url)
+    
+    def put(self, url: str, resp, items: List[RawContent]):
+        """保存响应校验头与解析结果"""
+        with self._lock:
+            self._load()[url] = {
+                'etag': resp.headers.get('ETag'),
+                'last_modified': resp.headers.get('Last-Modified'),
+                'time': time.time(),
+                # 存字典快照: 复用时 RawContent(**d) 重建，且不与返回给调用方的对象共享
+                'items': [item.to_dict() for item in items],
+            }
+            self._save()
+    
+    def touch(self, url: str):
+        """304 后刷新条目时间，TTL 重新计时"""
+        with self._lock:
+            entry = self._load().get(url)
+            if entry is not None:
+                entry['time'] = time.time()
+                self._save()
+    
+    def invalidate(self, url: str):
+        """请求失败时删除条目"""
+        with self._lock:
+            if self._load().pop(url, None) is not None:
+                self._save()
+
+
+response_cache = ResponseCache(Path(__file__).parent.parent / "data" / "cache" / "response_cache.json")
+
+
+# 信息量阈值：关键词采集累计到该条数后不再继续扇出
+INFO_LOAD_THETA = {
+    'douyin': 80,
+    'xiaohongshu': 100,
+    'weibo': 60,
+}
+
+
+def _cancel_pending(futures):
+    """取消尚未开始执行的任务 (已在执行的任务会正常跑完)"""
+    for future in futures:
+        future.cancel()
 
 
 class BaseCrawler:
@@ -204,37 +647,20 @@ class BaseCrawler:
     """
     
     def __init__(self, platform: str, proxy: str = None):
-        import requests
         self.platform = platform
         self.proxy = proxy
-        self.session = requests.Session()
+        self.session = get_session(proxy)
+        self._headers: Dict[str, str] = {}  # 本平台专用 headers，每次请求时合并
         self._request_count = 0
         self._error_count = 0
-        self._ua_index = random.randint(0, len(UA_POOL) - 1)
-        
-        # 基础 headers
-        self.session.headers.update({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache',
-        })
-        
-        if proxy:
-            self.session.proxies = {'http': proxy, 'https': proxy}
 
     def _rotate_ua(self) -> str:
-        """轮转 User-Agent"""
-        self._ua_index = (self._ua_index + random.randint(1, 5)) % len(UA_POOL)
-        ua = UA_POOL[self._ua_index]
-        self.session.headers['User-Agent'] = ua
-        return ua
+        """随机选取 User-Agent (随请求 headers 发送，不修改共享 Session)"""
+        return random.choice(UA_POOL)
 
     def _get_domain(self, url: str) -> str:
         """提取域名用于限流"""
-        from urllib.parse import urlparse
-        return urlparse(url).netloc
+        return _domain_of(url)
 
     def safe_request(self, url: str, method: str = 'GET', max_retries: int = 3, 
                      timeout: int = 15, **kwargs) -> Optional[object]:
@@ -249,6 +675,7 @@ class BaseCrawler:
         - 429 自动降速 (仅对临时限流重试)
         """
         domain = self._get_domain(url)
+        extra_headers = kwargs.pop('headers', None) or {}
         
         # 检查域名是否已被封禁
         if rate_limiter.is_blocked(domain):
@@ -260,12 +687,14 @@ class BaseCrawler:
                 # 限流等待
                 rate_limiter.wait(domain)
                 
-                # 轮转 UA
-                self._rotate_ua()
+                # 轮转 UA，与平台 headers 合并（调用方传入的 headers 优先）
+                headers = {**self._headers, 'User-Agent': self._rotate_ua(), **extra_headers}
                 
                 # 发送请求
                 self._request_count += 1
-                resp = self.session.request(method, url, timeout=timeout, **kwargs)
+                with rate_limiter.host_slot(domain):
+                    resp = self.session.request(method, url, timeout=timeout,
+                                                headers=headers, **kwargs)
                 
                 # === 401 Unauthorized: 需要登录，永久跳过 ===
                 if resp.status_code == 401:
@@ -280,29 +709,31 @@ class BaseCrawler:
                     fails = rate_limiter.record_fail(domain)
                     # 检查是否有 Retry-After 头（说明是临时限流）
                     retry_after = resp.headers.get('Retry-After')
-                    if retry_after and attempt < max_retries - 1:
+                    wait = _parse_retry_after(retry_after, 30) if retry_after else None
+                    if wait is not None and attempt < max_retries - 1:
                         # 有 Retry-After = 临时限流，等待后重试
-                        wait = min(int(retry_after), 30)
                         logger.warning(f"  ⏳ 403 临时限流 → 等待 {wait}s")
-                        time.sleep(wait)
+                        rate_limiter.decrease_rate(domain, retry_after=wait)
                         continue
                     elif fails >= 2:
                         # 连续2次403且无Retry-After → 永久封禁
                         rate_limiter.block(domain, '403 拒绝访问(需要Cookie/签名)')
                         return None
                     else:
-                        # 第一次403，短暂等待后重试一次
+                        # 第一次403，推迟该域名的下一次请求后重试一次
                         wait = 2 + random.uniform(0, 2)
                         logger.warning(f"  🚫 403 Forbidden → 等待 {wait:.0f}s")
-                        time.sleep(wait)
+                        rate_limiter.defer(domain, wait)
                         continue
                 
                 # === 429 Too Many Requests: 临时限流，降速重试 ===
                 if resp.status_code == 429:
-                    rate_limiter.penalize(domain, 2.0)
-                    wait = 2 ** (attempt + 1) + random.uniform(1, 3)
+                    retry_after = resp.headers.get('Retry-After')
+                    wait = _parse_retry_after(retry_after, 60) if retry_after else None
+                    if wait is None:  # 无头或无法解析 → 指数退避
+                        wait = 2 ** (attempt + 1) + random.uniform(1, 3)
                     logger.warning(f"  🚫 429 限流 → 等待 {wait:.0f}s")
-                    time.sleep(wait)
+                    rate_limiter.decrease_rate(domain, retry_after=wait)
                     continue
                 
                 # === 412 风控触发 ===
@@ -311,13 +742,13 @@ class BaseCrawler:
                     if fails >= 2:
                         rate_limiter.block(domain, '412 风控触发')
                         return None
-                    rate_limiter.penalize(domain, 3.0)
                     logger.warning(f"  🛡️ 412 风控触发 → 降速")
-                    time.sleep(5 + random.uniform(0, 5))
+                    rate_limiter.decrease_rate(domain, retry_after=5 + random.uniform(0, 5),
+                                               factor=1 / 3)  # 比 429 收缩得更狠
                     continue
                 
                 resp.raise_for_status()
-                rate_limiter.reset_penalty(domain)
+                rate_limiter.increase_rate(domain)
                 rate_limiter.reset_fail(domain)
                 return resp
                 
@@ -332,6 +763,54 @@ class BaseCrawler:
         
         return None
 
+    def cached_request(self, url: str, parse, ttl: int, **kwargs) -> List[RawContent]:
+        """
+        带响应缓存的请求
+        
+        Args:
+            url: 请求地址
+            parse: 响应 → List[RawContent] 的解析函数
+            ttl: 缓存有效期 (秒)
+            
+        Returns:
+            内容列表 (采集时间为本次)，请求失败时为空列表
+        """
+        entry = response_cache.get(url)
+        now_iso = datetime.now(timezone.utc).isoformat()
+        
+        if entry is None or time.time() - entry['time'] >= ttl:
+            headers = dict(kwargs.pop('headers', None) or {})
+            if entry is not None:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+            
+            resp = self.safe_request(url, headers=headers, **kwargs)
+            if resp is None:
+                response_cache.invalidate(url)
+                return []
+            if resp.status_code != 304 or entry is None:
+                items = parse(resp)
+                response_cache.put(url, resp, items)
+                return items
+            response_cache.touch(url)
+            logger.debug(f"  ♻️ 304 未变化，复用缓存: {url[:60]}")
+        
+        items = []
+        for d in entry['items']:
+            item = RawContent(**d)
+            item.crawl_time = now_iso
+            items.append(item)
+        return items
+
+    def info_load_reached(self, count: int) -> bool:
+        """已采集条数是否达到本平台的信息量阈值"""
+        if count < INFO_LOAD_THETA.get(self.platform, 80):
+            return False
+        logger.info(f"  ℹ️ {self.platform} 已采集 {count} 条，停止关键词扇出")
+        return True
+
     def is_domain_blocked(self, domain: str) -> bool:
         """检查域名是否已被封禁"""
         return rate_limiter.is_blocked(domain)
@@ -366,9 +845,12 @@ class DouyinCrawler(BaseCrawler):
     - 降级方案：使用页面 SSR 数据 + 搜索建议词
     """
     
+    # 关键词并发采集的线程数
+    KEYWORD_WORKERS = 4
+    
     def __init__(self, proxy=None):
         super().__init__('douyin', proxy)
-        self.session.headers.update({
+        self._headers.update({
             'Referer': 'https://www.douyin.com/',
         })
 
@@ -391,7 +873,7 @@ class DouyinCrawler(BaseCrawler):
             }
             resp = self.safe_request(url, params=params)
             if resp and resp.status_code == 200:
-                data = resp.json()
+                data = _json_loads(resp.content)
                 for item in data.get('data', []):
                     word = item.get('content', '').strip()
                     if word and word != keyword:
@@ -410,55 +892,68 @@ class DouyinCrawler(BaseCrawler):
         """
         items = []
         try:
-            url = f'https://www.douyin.com/search/{keyword}'
+            url = f'https://www.douyin.com/search/{_quote_kw(keyword)}'
             resp = self.safe_request(url, headers={'Accept': 'text/html'})
             if not resp:
                 return items
             
+            html = _response_text(resp)
+            
             # 尝试提取 SSR 数据
             # 抖音使用 RENDER_DATA 存储 SSR 数据 (URL encoded JSON)
-            m = re.search(r'<script\s+id="RENDER_DATA"[^>]*>(.+?)</script>', resp.text, re.DOTALL)
+            m = _RE_RENDER_DATA.search(html)
             if m:
-                import urllib.parse
-                raw = urllib.parse.unquote(m.group(1))
-                data = json.loads(raw)
+                raw = unquote(m.group(1))
+                data = _json_loads(raw)
                 
                 # 递归搜索 aweme 数据
                 aweme_list = self._extract_aweme_list(data)
+                now_iso = datetime.now(timezone.utc).isoformat()
                 for aweme in aweme_list[:20]:
-                    content = self._parse_aweme(aweme, keyword)
+                    content = self._parse_aweme(aweme, keyword, now_iso)
                     if content:
                         items.append(content)
             
             # 从 HTML 提取视频信息（降级方案）
             if not items:
-                items = self._parse_search_html(resp.text, keyword)
+                items = self._parse_search_html(html, keyword)
             
             logger.info(f"  🎵 抖音搜索 [{keyword}]: {len(items)} 条内容")
         except Exception as e:
             logger.debug(f"  ⚠️ 抖音搜索页失败 [{keyword}]: {str(e)[:60]}")
         return items
 
-    def _extract_aweme_list(self, data: dict, depth: int = 0) -> list:
-        """递归提取 aweme 列表"""
-        if depth > 10:
-            return []
-        results = []
-        if isinstance(data, dict):
-            if 'awemeList' in data:
-                return data['awemeList'] if isinstance(data['awemeList'], list) else []
-            if 'aweme_list' in data:
-                return data['aweme_list'] if isinstance(data['aweme_list'], list) else []
-            for v in data.values():
-                results.extend(self._extract_aweme_list(v, depth + 1))
-        elif isinstance(data, list):
-            for item in data:
-                if isinstance(item, dict):
-                    results.extend(self._extract_aweme_list(item, depth + 1))
-        return results
-
-    def _parse_aweme(self, aweme: dict, keyword: str) -> Optional[RawContent]:
-        """解析单个 aweme 对象"""
+    # 遍历 RENDER_DATA 时跳过的元数据分支（其中不会出现 aweme 列表）
+    _AWEME_SKIP_KEYS = frozenset(('user', 'comment', 'stats'))
+
+    def _extract_aweme_list(self, data: dict) -> list:
+        """
+        提取 aweme 列表
+        
+        显式栈深度优先遍历（按原文档顺序），命中第一个非空的 awemeList/aweme_list
+        即返回，不再遍历其余分支；记录已访问的容器，共享引用或环只遍历一次。
+        """
+        stack = deque([data])
+        visited = set()
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            if isinstance(node, dict):
+                for key in ('awemeList', 'aweme_list'):
+                    v = node.get(key)
+                    if isinstance(v, list) and v:
+                        return v
+                # 逆序入栈，保证先访问靠前的子节点
+                stack.extend(v for k, v in reversed(node.items())
+                             if k not in self._AWEME_SKIP_KEYS and isinstance(v, (dict, list)))
+            elif isinstance(node, list):
+                stack.extend(v for v in reversed(node) if isinstance(v, (dict, list)))
+        return []
+
+    def _parse_aweme(self, aweme: dict, keyword: str, now_iso: str) -> Optional[RawContent]:
+        """解析单个 aweme 对象 (now_iso: 本批次共用的采集时间)"""
         try:
             desc = aweme.get('desc', '').strip()
             if not desc:
@@ -478,7 +973,7 @@ class DouyinCrawler(BaseCrawler):
             aweme_id = aweme.get('aweme_id', '') or aweme.get('id', '')
             
             return RawContent(
-                platform='douyin',
+                platform=_DOUYIN,
                 content_id=f"dy_{aweme_id}",
                 title=desc[:100],
                 text=desc,
@@ -489,9 +984,9 @@ class DouyinCrawler(BaseCrawler):
                 views=int(stats.get('play_count', 0) or 0),
                 tags=tags,
                 url=f'https://www.douyin.com/video/{aweme_id}' if aweme_id else '',
-                pub_time=datetime.now(timezone.utc).isoformat(),
-                crawl_time=datetime.now(timezone.utc).isoformat(),
-                content_type='video',
+                pub_time=now_iso,
+                crawl_time=now_iso,
+                content_type=_VIDEO,
                 extra={'search_keyword': keyword}
             )
         except Exception:
@@ -500,20 +995,21 @@ class DouyinCrawler(BaseCrawler):
     def _parse_search_html(self, html: str, keyword: str) -> List[RawContent]:
         """从搜索页 HTML 提取基本信息（降级方案）"""
         items = []
+        now_iso = datetime.now(timezone.utc).isoformat()
         # 提取页面中的视频标题（meta/og:title 等）
-        titles = re.findall(r'<a[^>]*title="([^"]{5,})"[^>]*>', html)
+        titles = _extract_anchor_titles(html)
         for i, title in enumerate(titles[:15]):
             title = title.strip()
             if len(title) < 5 or title in ('搜索', '首页'):
                 continue
             items.append(RawContent(
-                platform='douyin',
-                content_id=f"dy_html_{hashlib.md5(title.encode()).hexdigest()[:10]}",
+                platform=_DOUYIN,
+                content_id=f"dy_html_{_short_hash(title)}",
                 title=title,
                 text=title,
                 tags=[keyword],
-                crawl_time=datetime.now(timezone.utc).isoformat(),
-                content_type='video',
+                crawl_time=now_iso,
+                content_type=_VIDEO,
                 extra={'search_keyword': keyword, 'parse_method': 'html'}
             ))
         return items
@@ -530,7 +1026,7 @@ class DouyinCrawler(BaseCrawler):
             url = f'https://www.douyin.com/search/{hashtag}?type=hashtag'
             resp = self.safe_request(url, headers={'Accept': 'text/html'})
             if resp:
-                items = self._parse_search_html(resp.text, hashtag)
+                items = self._parse_search_html(_response_text(resp), hashtag)
                 logger.info(f"  #️⃣ 抖音话题 [{hashtag}]: {len(items)} 条")
         except Exception as e:
             logger.debug(f"  ⚠️ 抖音话题失败 [{hashtag}]: {str(e)[:60]}")
@@ -550,32 +1046,37 @@ class DouyinCrawler(BaseCrawler):
         
         if not keywords:
             # 从所有领域随机抽样
-            all_seeds = []
-            for category_words in SEED_KEYWORDS.values():
-                all_seeds.extend(category_words)
-            keywords = random.sample(all_seeds, min(max_keywords, len(all_seeds)))
+            keywords = random.sample(ALL_SEED_KEYWORDS, min(max_keywords, len(ALL_SEED_KEYWORDS)))
         
         logger.info(f"\n🎵 抖音采集 [{len(keywords)} 个关键词]")
         
-        for kw in keywords:
-            if self.is_domain_blocked('www.douyin.com'):
-                logger.info(f"  ⏭️ 抖音域名已封禁，停止采集")
-                break
+        # 所有 (关键词, 接口) 请求放入同一个线程池并发执行；
+        # 同域名的请求节奏和在途数量仍由 rate_limiter 控制
+        with ThreadPoolExecutor(max_workers=self.KEYWORD_WORKERS) as executor:
             # 搜索建议词（发现用户实时搜索趋势）
-            suggestions = self.crawl_search_suggest(kw)
-            all_discovered_words.extend(suggestions[:5])
-            
+            suggest_futures = [executor.submit(self.crawl_search_suggest, kw) for kw in keywords]
             # 搜索页内容
-            items = self.crawl_search_page(kw)
-            all_items.extend(items)
-        
-        # 二级扩展：对发现的热门建议词做进一步采集
-        if all_discovered_words:
-            expand_words = random.sample(all_discovered_words, 
-                                         min(3, len(all_discovered_words)))
-            for word in expand_words:
-                items = self.crawl_search_page(word)
-                all_items.extend(items)
+            search_futures = [executor.submit(self.crawl_search_page, kw) for kw in keywords]
+            
+            for future in suggest_futures:
+                all_discovered_words.extend(future.result()[:5])
+            
+            enough = False
+            for future in search_futures:
+                all_items.extend(future.result())
+                if self.info_load_reached(len(all_items)):
+                    _cancel_pending(search_futures)
+                    enough = True
+                    break
+            
+            # 二级扩展：对发现的热门建议词做进一步采集 (信息量已够时跳过)
+            if self.is_domain_blocked('www.douyin.com'):
+                logger.info(f"  ⏭️ 抖音域名已封禁，停止采集")
+            elif all_discovered_words and not enough:
+                expand_words = random.sample(all_discovered_words, 
+                                             min(3, len(all_discovered_words)))
+                for items in executor.map(self.crawl_search_page, expand_words):
+                    all_items.extend(items)
         
         logger.info(f"  📊 抖音采集完成: {len(all_items)} 条内容, "
                      f"发现 {len(all_discovered_words)} 个趋势词")
@@ -603,7 +1104,7 @@ class XiaohongshuCrawler(BaseCrawler):
     
     def __init__(self, proxy=None):
         super().__init__('xiaohongshu', proxy)
-        self.session.headers.update({
+        self._headers.update({
             'Referer': 'https://www.xiaohongshu.com/',
         })
 
@@ -619,14 +1120,15 @@ class XiaohongshuCrawler(BaseCrawler):
             resp = self.safe_request('https://www.xiaohongshu.com/explore')
             if not resp:
                 return items
+            now_iso = datetime.now(timezone.utc).isoformat()
             
-            m = re.search(r'window\.__INITIAL_STATE__\s*=\s*(.+?)</script>', resp.text, re.DOTALL)
+            m = _RE_INITIAL_STATE.search(_response_text(resp))
             if not m:
                 logger.warning("  ❌ 小红书 Explore: 无法解析 SSR 数据")
                 return items
             
             raw = m.group(1).strip().rstrip(';').replace('undefined', 'null')
-            data = json.loads(raw)
+            data = _json_loads(raw)
             feeds = data.get('feed', {}).get('feeds', [])
             
             for entry in feeds[:30]:
@@ -640,11 +1142,7 @@ class XiaohongshuCrawler(BaseCrawler):
                 note_type = nc.get('type', 'normal')
                 note_id = entry.get('id', '')
                 
-                likes_str = str(interact.get('likedCount', '0'))
-                try:
-                    likes = int(likes_str.replace('万', '0000').replace('.', '').replace('+', ''))
-                except ValueError:
-                    likes = 0
+                likes = _parse_cn_count(str(interact.get('likedCount', '0')))
                 
                 # 提取话题标签
                 tags = []
@@ -655,7 +1153,7 @@ class XiaohongshuCrawler(BaseCrawler):
                         tags.append(tag_name)
                 
                 items.append(RawContent(
-                    platform='xiaohongshu',
+                    platform=_XHS,
                     content_id=f"xhs_{note_id}",
                     title=title,
                     text=title,  # explore 页面通常只有标题
@@ -663,8 +1161,8 @@ class XiaohongshuCrawler(BaseCrawler):
                     likes=likes,
                     tags=tags,
                     url=f'https://www.xiaohongshu.com/explore/{note_id}' if note_id else '',
-                    crawl_time=datetime.now(timezone.utc).isoformat(),
-                    content_type='video' if note_type == 'video' else 'note',
+                    crawl_time=now_iso,
+                    content_type=_VIDEO if note_type == 'video' else _NOTE,
                 ))
             
             logger.info(f"  📕 小红书 Explore: {len(items)} 条内容")
@@ -680,19 +1178,20 @@ class XiaohongshuCrawler(BaseCrawler):
         """
         items = []
         try:
-            import urllib.parse
-            encoded_kw = urllib.parse.quote(keyword)
-            url = f'https://www.xiaohongshu.com/search_result?keyword={encoded_kw}&source=web_search_result_notes'
+            url = f'https://www.xiaohongshu.com/search_result?keyword={_quote_kw(keyword)}&source=web_search_result_notes'
             
             resp = self.safe_request(url, headers={'Accept': 'text/html'})
             if not resp:
                 return items
+            now_iso = datetime.now(timezone.utc).isoformat()
+            
+            html = _response_text(resp)
             
             # 尝试解析 SSR 数据
-            m = re.search(r'window\.__INITIAL_STATE__\s*=\s*(.+?)</script>', resp.text, re.DOTALL)
+            m = _RE_INITIAL_STATE.search(html)
             if m:
                 raw = m.group(1).strip().rstrip(';').replace('undefined', 'null')
-                data = json.loads(raw)
+                data = _json_loads(raw)
                 
                 # 搜索结果在 search.notes 或 search.feeds 中
                 notes = (data.get('search', {}).get('notes', {}).get('items', []) or
@@ -708,39 +1207,35 @@ class XiaohongshuCrawler(BaseCrawler):
                     interact = note.get('interactInfo', {}) if isinstance(note.get('interactInfo'), dict) else {}
                     note_id = entry.get('id', '') if isinstance(entry, dict) else ''
                     
-                    likes_str = str(interact.get('likedCount', '0'))
-                    try:
-                        likes = int(likes_str.replace('万', '0000').replace('.', '').replace('+', ''))
-                    except ValueError:
-                        likes = 0
+                    likes = _parse_cn_count(str(interact.get('likedCount', '0')))
                     
                     items.append(RawContent(
-                        platform='xiaohongshu',
-                        content_id=f"xhs_s_{hashlib.md5(title.encode()).hexdigest()[:10]}",
+                        platform=_XHS,
+                        content_id=f"xhs_s_{_short_hash(title)}",
                         title=title,
                         text=title,
                         author=user.get('nickname', ''),
                         likes=likes,
                         tags=[keyword],
                         url=f'https://www.xiaohongshu.com/explore/{note_id}' if note_id else '',
-                        crawl_time=datetime.now(timezone.utc).isoformat(),
-                        content_type='note',
+                        crawl_time=now_iso,
+                        content_type=_NOTE,
                         extra={'search_keyword': keyword}
                     ))
             
             # 降级：从 HTML 提取
             if not items:
-                titles = re.findall(r'<a[^>]*class="[^"]*title[^"]*"[^>]*>([^<]{5,})</a>', resp.text)
+                titles = _extract_xhs_titles(html)
                 for title in titles[:15]:
                     title = title.strip()
                     items.append(RawContent(
-                        platform='xiaohongshu',
-                        content_id=f"xhs_h_{hashlib.md5(title.encode()).hexdigest()[:10]}",
+                        platform=_XHS,
+                        content_id=f"xhs_h_{_short_hash(title)}",
                         title=title,
                         text=title,
                         tags=[keyword],
-                        crawl_time=datetime.now(timezone.utc).isoformat(),
-                        content_type='note',
+                        crawl_time=now_iso,
+                        content_type=_NOTE,
                         extra={'search_keyword': keyword, 'parse_method': 'html'}
                     ))
             
@@ -754,10 +1249,7 @@ class XiaohongshuCrawler(BaseCrawler):
         all_items = []
         
         if not keywords:
-            all_seeds = []
-            for category_words in SEED_KEYWORDS.values():
-                all_seeds.extend(category_words)
-            keywords = random.sample(all_seeds, min(max_keywords, len(all_seeds)))
+            keywords = random.sample(ALL_SEED_KEYWORDS, min(max_keywords, len(ALL_SEED_KEYWORDS)))
         
         logger.info(f"\n📕 小红书采集 [{len(keywords)} 个关键词]")
         
@@ -780,6 +1272,8 @@ class XiaohongshuCrawler(BaseCrawler):
             else:
                 empty_count = 0
             all_items.extend(items)
+            if self.info_load_reached(len(all_items)):
+                break
         
         logger.info(f"  📊 小红书采集完成: {len(all_items)} 条内容")
         return all_items
@@ -794,6 +1288,9 @@ class WeiboCrawler(BaseCrawler):
     用于与抖音/小红书数据交叉验证。
     """
     
+    # 话题并发采集的线程数
+    TOPIC_WORKERS = 4
+    
     def __init__(self, proxy=None):
         super().__init__('weibo', proxy)
 
@@ -802,73 +1299,81 @@ class WeiboCrawler(BaseCrawler):
         items = []
         try:
             # 微博热搜 AJAX (不是抖音/小红书的热搜，允许使用)
-            resp = self.safe_request('https://weibo.com/ajax/side/hotSearch')
-            if not resp:
-                return items
-            
-            data = resp.json()
-            realtime = data.get('data', {}).get('realtime', [])
-            
-            for entry in realtime[:30]:
-                word = entry.get('word', '').strip()
-                if not word:
-                    continue
-                
-                items.append(RawContent(
-                    platform='weibo',
-                    content_id=f"wb_{hashlib.md5(word.encode()).hexdigest()[:10]}",
-                    title=word,
-                    text=entry.get('label_name', '') + ' ' + word,
-                    views=int(entry.get('raw_hot', 0) or 0),
-                    tags=[entry.get('category', '')],
-                    url=f'https://s.weibo.com/weibo?q={word}',
-                    crawl_time=datetime.now(timezone.utc).isoformat(),
-                    content_type='topic',
-                    extra={
-                        'is_hot': entry.get('is_hot', 0),
-                        'is_new': entry.get('is_new', 0),
-                        'is_fei': entry.get('is_fei', 0),
-                        'category': entry.get('category', ''),
-                        'raw_hot': entry.get('raw_hot', 0),
-                    }
-                ))
+            items = self.cached_request('https://weibo.com/ajax/side/hotSearch',
+                                        self._parse_realtime, RESPONSE_CACHE_TTL['realtime'])
             logger.info(f"  🐦 微博实时: {len(items)} 条")
         except Exception as e:
             logger.error(f"  ❌ 微博采集失败: {str(e)[:80]}")
         return items
 
+    def _parse_realtime(self, resp) -> List[RawContent]:
+        """解析微博热搜接口"""
+        now_iso = datetime.now(timezone.utc).isoformat()
+        data = _json_loads(resp.content)
+        realtime = data.get('data', {}).get('realtime', [])
+        
+        # 先过滤掉空词条，再一次性构建
+        rows = ((word, entry) for entry in realtime[:30]
+                if (word := entry.get('word', '').strip()))
+        return [
+            RawContent(
+                platform='weibo',
+                content_id=f"wb_{_short_hash(word)}",
+                title=word,
+                text=entry.get('label_name', '') + ' ' + word,
+                views=int(entry.get('raw_hot', 0) or 0),
+                tags=[entry.get('category', '')],
+                url=f'https://s.weibo.com/weibo?q={_quote_kw(word)}',
+                crawl_time=now_iso,
+                content_type='topic',
+                extra={
+                    'is_hot': entry.get('is_hot', 0),
+                    'is_new': entry.get('is_new', 0),
+                    'is_fei': entry.get('is_fei', 0),
+                    'category': entry.get('category', ''),
+                    'raw_hot': entry.get('raw_hot', 0),
+                }
+            )
+            for word, entry in rows
+        ]
+
     def crawl_topic_feed(self, topic: str) -> List[RawContent]:
         """微博话题 Feed"""
         items = []
         try:
-            import urllib.parse
-            url = f'https://weibo.com/ajax/statuses/topic?q={urllib.parse.quote(topic)}&count=20'
-            resp = self.safe_request(url)
-            if resp:
-                data = resp.json()
-                for status in data.get('data', {}).get('statuses', [])[:15]:
-                    text = status.get('text_raw', status.get('text', '')).strip()
-                    if not text:
-                        continue
-                    user = status.get('user', {})
-                    items.append(RawContent(
-                        platform='weibo',
-                        content_id=f"wb_t_{status.get('id', '')}",
-                        title=text[:100],
-                        text=text,
-                        author=user.get('screen_name', ''),
-                        likes=int(status.get('attitudes_count', 0) or 0),
-                        comments=int(status.get('comments_count', 0) or 0),
-                        shares=int(status.get('reposts_count', 0) or 0),
-                        tags=[topic],
-                        crawl_time=datetime.now(timezone.utc).isoformat(),
-                        content_type='status',
-                    ))
+            url = f'https://weibo.com/ajax/statuses/topic?q={_quote_kw(topic)}&count=20'
+            items = self.cached_request(url, functools.partial(self._parse_topic_feed, topic=topic),
+                                        RESPONSE_CACHE_TTL['topic'])
             logger.info(f"  🐦 微博话题 [{topic}]: {len(items)} 条")
         except Exception as e:
             logger.debug(f"  ⚠️ 微博话题失败 [{topic}]: {str(e)[:60]}")
         return items
 
+    def _parse_topic_feed(self, resp, topic: str) -> List[RawContent]:
+        """解析微博话题 Feed 接口"""
+        items = []
+        now_iso = datetime.now(timezone.utc).isoformat()
+        data = _json_loads(resp.content)
+        for status in data.get('data', {}).get('statuses', [])[:15]:
+            text = status.get('text_raw', status.get('text', '')).strip()
+            if not text:
+                continue
+            user = status.get('user', {})
+            items.append(RawContent(
+                platform='weibo',
+                content_id=f"wb_t_{status.get('id', '')}",
+                title=text[:100],
+                text=text,
+                author=user.get('screen_name', ''),
+                likes=int(status.get('attitudes_count', 0) or 0),
+                comments=int(status.get('comments_count', 0) or 0),
+                shares=int(status.get('reposts_count', 0) or 0),
+                tags=[topic],
+                crawl_time=now_iso,
+                content_type='status',
+            ))
+        return items
+
     def crawl_all(self, keywords=None, max_keywords=5) -> List[RawContent]:
         all_items = self.crawl_realtime()
         
@@ -878,18 +1383,30 @@ class WeiboCrawler(BaseCrawler):
             return all_items
         
         if keywords:
-            for kw in keywords[:max_keywords]:
-                if self.is_domain_blocked('weibo.com'):
-                    break
-                items = self.crawl_topic_feed(kw)
-                all_items.extend(items)
+            # 多个话题并发采集，同域名的请求节奏和在途数量仍由 rate_limiter 控制
+            with ThreadPoolExecutor(max_workers=self.TOPIC_WORKERS) as executor:
+                futures = [executor.submit(self._topic_task, kw) for kw in keywords[:max_keywords]]
+                for future in futures:
+                    all_items.extend(future.result())
+                    if self.info_load_reached(len(all_items)):
+                        _cancel_pending(futures)
+                        break
         
         return all_items
 
+    def _topic_task(self, topic: str) -> List[RawContent]:
+        """单个话题的采集任务 (域名被封禁后直接跳过)"""
+        if self.is_domain_blocked('weibo.com'):
+            return []
+        return self.crawl_topic_feed(topic)
+
 
 class BilibiliCrawler(BaseCrawler):
     """B站热门视频采集"""
     
+    # 响应超过该大小时 (装了 ijson) 改为流式解析
+    IJSON_MIN_BYTES = 50 * 1024
+    
     def __init__(self, proxy=None):
         super().__init__('bilibili', proxy)
 
@@ -897,38 +1414,45 @@ class BilibiliCrawler(BaseCrawler):
         """B站热门视频"""
         items = []
         try:
-            resp = self.safe_request('https://api.bilibili.com/x/web-interface/popular?ps=50&pn=1')
-            if not resp:
-                return items
-            
-            data = resp.json()
-            for entry in data.get('data', {}).get('list', [])[:30]:
-                title = entry.get('title', '').strip()
-                if not title:
-                    continue
-                
-                stat = entry.get('stat', {})
-                owner = entry.get('owner', {})
-                
-                items.append(RawContent(
-                    platform='bilibili',
-                    content_id=f"bl_{entry.get('bvid', '')}",
-                    title=title,
-                    text=entry.get('desc', title),
-                    author=owner.get('name', ''),
-                    likes=int(stat.get('like', 0)),
-                    comments=int(stat.get('reply', 0)),
-                    shares=int(stat.get('share', 0)),
-                    views=int(stat.get('view', 0)),
-                    url=f"https://www.bilibili.com/video/{entry.get('bvid', '')}",
-                    crawl_time=datetime.now(timezone.utc).isoformat(),
-                    content_type='video',
-                ))
+            items = self.cached_request('https://api.bilibili.com/x/web-interface/popular?ps=50&pn=1',
+                                        self._parse_popular, RESPONSE_CACHE_TTL['realtime'])
             logger.info(f"  📺 B站热门: {len(items)} 条")
         except Exception as e:
             logger.error(f"  ❌ B站采集失败: {str(e)[:80]}")
         return items
 
+    def _parse_popular(self, resp) -> List[RawContent]:
+        """解析 B站热门接口"""
+        now_iso = datetime.now(timezone.utc).isoformat()
+        content = resp.content
+        if ijson is not None and len(content) > self.IJSON_MIN_BYTES:
+            # 只解析前 30 条，其余条目不建对象
+            entries = itertools.islice(
+                ijson.items(io.BytesIO(content), 'data.list.item', use_float=True), 30)
+        else:
+            entries = _json_loads(content).get('data', {}).get('list', [])[:30]
+        
+        # 先过滤掉空标题，再一次性构建
+        rows = ((title, entry, entry.get('stat', {}), entry.get('owner', {}))
+                for entry in entries if (title := entry.get('title', '').strip()))
+        return [
+            RawContent(
+                platform='bilibili',
+                content_id=f"bl_{entry.get('bvid', '')}",
+                title=title,
+                text=entry.get('desc', title),
+                author=owner.get('name', ''),
+                likes=int(stat.get('like', 0)),
+                comments=int(stat.get('reply', 0)),
+                shares=int(stat.get('share', 0)),
+                views=int(stat.get('view', 0)),
+                url=f"https://www.bilibili.com/video/{entry.get('bvid', '')}",
+                crawl_time=now_iso,
+                content_type='video',
+            )
+            for title, entry, stat, owner in rows
+        ]
+
     def crawl_all(self, keywords=None, max_keywords=5) -> List[RawContent]:
         return self.crawl_popular()
 
@@ -938,7 +1462,7 @@ class ZhihuCrawler(BaseCrawler):
     
     def __init__(self, proxy=None):
         super().__init__('zhihu', proxy)
-        self.session.headers.update({
+        self._headers.update({
             'Referer': 'https://www.zhihu.com/',
         })
 
@@ -946,33 +1470,37 @@ class ZhihuCrawler(BaseCrawler):
         """知乎热榜"""
         items = []
         try:
-            resp = self.safe_request('https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total?limit=50')
-            if not resp:
-                return items
-            
-            data = resp.json()
-            for entry in data.get('data', [])[:30]:
-                target = entry.get('target', {})
-                title = target.get('title', '').strip()
-                if not title:
-                    continue
-                
-                items.append(RawContent(
-                    platform='zhihu',
-                    content_id=f"zh_{target.get('id', '')}",
-                    title=title,
-                    text=target.get('excerpt', title),
-                    views=int(entry.get('detail_text', '0').replace('万热度', '0000').replace('热度', '').strip() or 0),
-                    url=f"https://www.zhihu.com/question/{target.get('id', '')}",
-                    crawl_time=datetime.now(timezone.utc).isoformat(),
-                    content_type='question',
-                    extra={'hot_text': entry.get('detail_text', '')}
-                ))
+            items = self.cached_request('https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total?limit=50',
+                                        self._parse_hot, RESPONSE_CACHE_TTL['realtime'])
             logger.info(f"  💬 知乎热榜: {len(items)} 条")
         except Exception as e:
             logger.error(f"  ❌ 知乎采集失败: {str(e)[:80]}")
         return items
 
+    def _parse_hot(self, resp) -> List[RawContent]:
+        """解析知乎热榜接口"""
+        now_iso = datetime.now(timezone.utc).isoformat()
+        data = _json_loads(resp.content)
+        
+        # 先过滤掉空标题，再一次性构建
+        pairs = ((entry, entry.get('target', {})) for entry in data.get('data', [])[:30])
+        rows = ((title, entry, target) for entry, target in pairs
+                if (title := target.get('title', '').strip()))
+        return [
+            RawContent(
+                platform='zhihu',
+                content_id=f"zh_{target.get('id', '')}",
+                title=title,
+                text=target.get('excerpt', title),
+                views=int(entry.get('detail_text', '0').replace('万热度', '0000').replace('热度', '').strip() or 0),
+                url=f"https://www.zhihu.com/question/{target.get('id', '')}",
+                crawl_time=now_iso,
+                content_type='question',
+                extra={'hot_text': entry.get('detail_text', '')}
+            )
+            for title, entry, target in rows
+        ]
+
     def crawl_all(self, keywords=None, max_keywords=5) -> List[RawContent]:
         return self.crawl_hot()
 
@@ -988,45 +1516,56 @@ class BaiduCrawler(BaseCrawler):
         items = []
         try:
             # 百度需要桌面UA + 完整Accept头才返回SSR数据
-            resp = self.safe_request('https://top.baidu.com/board?tab=realtime',
-                                     headers={
-                                         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                                         'Accept-Encoding': 'gzip, deflate',  # 不要br，避免brotli解码问题
-                                         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-                                     })
-            if not resp:
-                return items
-            
-            # 解析 SSR 数据
-            m = re.search(r'<!--s-data:(.*?)-->', resp.text, re.DOTALL)
-            if m:
-                data = json.loads(m.group(1))
-                cards = data.get('data', {}).get('cards', [])
-                for card in cards:
-                    for item in card.get('content', [])[:30]:
-                        title = item.get('word', '').strip()
-                        if not title:
-                            continue
-                        items.append(RawContent(
-                            platform='baidu',
-                            content_id=f"bd_{hashlib.md5(title.encode()).hexdigest()[:10]}",
-                            title=title,
-                            text=item.get('desc', title),
-                            views=int(item.get('hotScore', 0) or 0),
-                            url=item.get('url', ''),
-                            crawl_time=datetime.now(timezone.utc).isoformat(),
-                            content_type='search',
-                        ))
+            items = self.cached_request('https://top.baidu.com/board?tab=realtime',
+                                        self._parse_realtime, RESPONSE_CACHE_TTL['realtime'],
+                                        headers={
+                                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                                            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+                                        })
             logger.info(f"  🔍 百度热搜: {len(items)} 条")
         except Exception as e:
             logger.error(f"  ❌ 百度采集失败: {str(e)[:80]}")
         return items
 
+    def _parse_realtime(self, resp) -> List[RawContent]:
+        """解析百度热搜页面的 SSR 数据"""
+        items = []
+        now_iso = datetime.now(timezone.utc).isoformat()
+        m = _RE_BAIDU_SDATA.search(resp.content)
+        if m:
+            data = _json_loads(m.group(1))
+            cards = data.get('data', {}).get('cards', [])
+            for card in cards:
+                for item in card.get('content', [])[:30]:
+                    title = item.get('word', '').strip()
+                    if not title:
+                        continue
+                    items.append(RawContent(
+                        platform='baidu',
+                        content_id=f"bd_{_short_hash(title)}",
+                        title=title,
+                        text=item.get('desc', title),
+                        views=int(item.get('hotScore', 0) or 0),
+                        url=item.get('url', ''),
+                        crawl_time=now_iso,
+                        content_type='search',
+                    ))
+        return items
+
     def crawl_all(self, keywords=None, max_keywords=5) -> List[RawContent]:
         return self.crawl_realtime()
 
 
 # ==================== 采集编排器 ====================
+# 原始数据保留天数与每次保存后触发清理的概率
+RAW_RETENTION_DAYS = 7
+RAW_CLEANUP_PROBABILITY = 0.1
+
+# 平台耗时记录：每个平台保留最近 N 次，无记录时按默认耗时排序
+LATENCY_HISTORY = 20
+DEFAULT_LATENCY = 10.0
+
+
 class CrawlOrchestrator:
     """
     采集编排器 - 调度多平台采集任务
@@ -1038,11 +1577,24 @@ class CrawlOrchestrator:
     4. 原始数据落盘
     """
     
+    # 平台域名映射（用于封禁检查）
+    PLATFORM_DOMAINS = {
+        'douyin': 'www.douyin.com',
+        'xiaohongshu': 'www.xiaohongshu.com',
+        'weibo': 'weibo.com',
+        'bilibili': 'api.bilibili.com',
+        'zhihu': 'www.zhihu.com',
+        'baidu': 'top.baidu.com',
+    }
+    
     def __init__(self, proxy: str = None, save_raw: bool = True):
         self.proxy = proxy
         self.save_raw = save_raw
         self.data_dir = Path(__file__).parent.parent / "data"
         self.raw_dir = self.data_dir / "raw_feeds"
+        self.latency_file = self.data_dir / "cache" / "platform_latency.json"
+        self._latency = self._load_latency()
+        self._latency_lock = threading.Lock()
         
         # 初始化各平台爬虫（可靠平台优先）
         self.crawlers = {
@@ -1062,18 +1614,18 @@ class CrawlOrchestrator:
         - 每个领域至少选 2 个（保证覆盖面）
         - 总数控制在 count 以内
         - 随机化防止被识别为固定采集模式
+        - 名额有富余时从全部关键词中补足 (词多的领域自然多占)
         """
-        selected = []
-        categories = list(SEED_KEYWORDS.keys())
-        per_cat = max(2, count // len(categories))
-        
-        for cat in categories:
-            words = SEED_KEYWORDS[cat]
-            chosen = random.sample(words, min(per_cat, len(words)))
-            selected.extend(chosen)
+        selected = [w for words in SEED_KEYWORDS.values()
+                    for w in random.sample(words, min(2, len(words)))]
+        if len(selected) >= count:
+            return random.sample(selected, count)
         
+        chosen = set(selected)
+        pool = [w for w in ALL_SEED_KEYWORDS if w not in chosen]
+        selected += random.sample(pool, min(count - len(selected), len(pool)))
         random.shuffle(selected)
-        return selected[:count]
+        return selected
 
     def crawl_all(self, platforms: List[str] = None, 
                   keyword_count: int = 10) -> List[RawContent]:
@@ -1089,62 +1641,180 @@ class CrawlOrchestrator:
         """
         if platforms is None:
             platforms = list(self.crawlers.keys())
+        platforms = self._order_by_latency(p for p in platforms if p in self.crawlers)
         
         keywords = self.select_keywords(keyword_count)
         all_items: List[RawContent] = []
         stats = {}
         
         start_time = time.time()
+        self._log_start(platforms, keywords)
+        platforms = self._skip_blocked(platforms, stats)
+        
+        # 各平台在独立线程中采集，结果在主线程按平台顺序合并
+        with ThreadPoolExecutor(max_workers=min(16, max(1, len(platforms)))) as executor:
+            results = executor.map(lambda p: self._crawl_platform(p, keywords), platforms)
+            for platform, (items, stat) in zip(platforms, results):
+                stats[platform] = stat
+                all_items.extend(items)
+        
+        return self._finalize(all_items, stats, time.time() - start_time)
+
+    async def crawl_all_async(self, platforms: List[str] = None,
+                              keyword_count: int = 10,
+                              max_concurrency: int = 10) -> List[RawContent]:
+        """
+        并发执行全平台采集
+        
+        各平台爬虫仍基于 requests 同步实现，这里通过 asyncio.to_thread
+        把每个平台放入工作线程，并用 asyncio.gather 同时等待，
+        总耗时由各平台耗时之和降为最慢平台的耗时。
+        同域名的请求仍由全局 rate_limiter 控制节奏。
+        
+        Args:
+            platforms: 要采集的平台列表，默认全部
+            keyword_count: 种子关键词数量
+            max_concurrency: 同时运行的平台数上限
+            
+        Returns:
+            所有平台的原始内容列表
+        """
+        if platforms is None:
+            platforms = list(self.crawlers.keys())
+        platforms = self._order_by_latency(p for p in platforms if p in self.crawlers)
+        
+        keywords = self.select_keywords(keyword_count)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        start_time = time.time()
+        self._log_start(platforms, keywords)
+        stats = {}
+        platforms = self._skip_blocked(platforms, stats)
+        
+        async def run(platform):
+            async with semaphore:
+                return await asyncio.to_thread(self._crawl_platform, platform, keywords)
+        
+        results = await asyncio.gather(*(run(p) for p in platforms),
+                                       return_exceptions=True)
+        
+        all_items: List[RawContent] = []
+        for platform, result in zip(platforms, results):
+            if isinstance(result, BaseException):
+                logger.error(f"  ❌ {platform} 采集异常: {str(result)[:80]}")
+                stats[platform] = {'error': str(result)[:80]}
+                continue
+            items, stats[platform] = result
+            all_items.extend(items)
+        
+        # 去重 (SimHash) 与落盘放到工作线程，不阻塞调用方事件循环上的其他任务
+        return await asyncio.to_thread(self._finalize, all_items, stats,
+                                       time.time() - start_time)
+
+    def _load_latency(self) -> Dict[str, List[float]]:
+        """读取各平台历史采集耗时"""
+        try:
+            return _json_loads(self.latency_file.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.debug(f"  ⚠️ 平台耗时记录损坏，已忽略: {str(e)[:60]}")
+            return {}
+
+    def _save_latency(self):
+        """保存各平台历史采集耗时"""
+        self.latency_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.latency_file.with_suffix('.tmp')
+        with self._latency_lock:
+            tmp.write_bytes(_json_dumps(self._latency))
+            os.replace(tmp, self.latency_file)
+
+    def _record_latency(self, platform: str, elapsed: float):
+        """记录一次平台采集耗时"""
+        with self._latency_lock:
+            history = self._latency.setdefault(platform, [])
+            history.append(round(elapsed, 2))
+            del history[:-LATENCY_HISTORY]
+
+    def _order_by_latency(self, platforms) -> List[str]:
+        """
+        按历史耗时中位数升序排列平台
+        
+        快的平台先提交，结果先就绪；无记录的平台排在有记录的快平台之后，
+        耗时相同时保持原有顺序
+        """
+        def p50(platform):
+            history = self._latency.get(platform)
+            return statistics.median(history) if history else DEFAULT_LATENCY
+        return sorted(platforms, key=p50)
+
+    def _log_start(self, platforms: List[str], keywords: List[str]):
+        """输出采集开始信息"""
         logger.info(f"\n{'='*60}")
         logger.info(f"🌐 多平台采集开始 [{datetime.now().strftime('%H:%M:%S')}]")
         logger.info(f"   平台: {', '.join(platforms)}")
         logger.info(f"   关键词: {', '.join(keywords[:5])}...")
         logger.info(f"{'='*60}")
+
+    def _skip_blocked(self, platforms: List[str], stats: Dict) -> List[str]:
+        """
+        按封禁快照过滤平台
         
-        # 平台域名映射（用于封禁检查）
-        platform_domains = {
-            'douyin': 'www.douyin.com',
-            'xiaohongshu': 'www.xiaohongshu.com',
-            'weibo': 'weibo.com',
-            'bilibili': 'api.bilibili.com',
-            'zhihu': 'www.zhihu.com',
-            'baidu': 'top.baidu.com',
-        }
-        
+        开始前取一次快照，域名已封禁的平台直接记入统计、不再提交执行；
+        运行中新出现的封禁仍由各爬虫的请求层实时检查
+        """
+        blocked = rate_limiter.blocked_domains()
+        active = []
         for platform in platforms:
-            crawler = self.crawlers.get(platform)
-            if not crawler:
-                continue
-            
-            # 检查域名是否已被封禁，跳过整个平台
-            domain = platform_domains.get(platform, '')
-            if domain and rate_limiter.is_blocked(domain):
+            if self.PLATFORM_DOMAINS.get(platform) in blocked:
                 logger.info(f"  ⏭️ 跳过 {platform} (域名已封禁)")
                 stats[platform] = {'status': 'blocked', 'items': 0}
-                continue
-            
-            try:
-                platform_start = time.time()
-                items = crawler.crawl_all(keywords=keywords)
-                platform_elapsed = time.time() - platform_start
-                all_items.extend(items)
-                stats[platform] = crawler.stats()
-                stats[platform]['items'] = len(items)
-                stats[platform]['time'] = f"{platform_elapsed:.1f}s"
-            except Exception as e:
-                logger.error(f"  ❌ {platform} 采集异常: {str(e)[:80]}")
-                stats[platform] = {'error': str(e)[:80]}
+            else:
+                active.append(platform)
+        return active
+
+    def _crawl_platform(self, platform: str, 
+                        keywords: List[str]) -> Tuple[List[RawContent], Dict]:
+        """
+        采集单个平台
         
-        elapsed = time.time() - start_time
+        Returns:
+            (内容列表, 统计信息)
+        """
+        crawler = self.crawlers[platform]
         
-        # 去重
+        try:
+            platform_start = time.time()
+            items = crawler.crawl_all(keywords=keywords)
+            platform_elapsed = time.time() - platform_start
+            self._record_latency(platform, platform_elapsed)
+            stat = crawler.stats()
+            stat['items'] = len(items)
+            stat['time'] = f"{platform_elapsed:.1f}s"
+            return items, stat
+        except Exception as e:
+            logger.error(f"  ❌ {platform} 采集异常: {str(e)[:80]}")
+            return [], {'error': str(e)[:80]}
+
+    def _finalize(self, all_items: List[RawContent], stats: Dict,
+                  elapsed: float) -> List[RawContent]:
+        """去重、输出汇总并保存原始数据"""
+        # 去重 (保留首次出现的条目及其顺序)
+        # 先用精确键挡掉完全相同的标题，再用 SimHash 挡掉只差话题符号/表情的近重复
         seen = set()
+        index = SimHashIndex()
         unique_items = []
         for item in all_items:
-            key = item.title[:30].lower().replace(' ', '')
-            if key not in seen:
-                seen.add(key)
-                unique_items.append(item)
+            key = _dedup_key(item.title)
+            if key in seen:
+                continue
+            seen.add(key)
+            h = simhash(item.title)
+            if index.has_near_dup(h):
+                continue
+            index.add(h)
+            item.extra['simhash'] = h
+            unique_items.append(item)
         
         logger.info(f"\n📊 采集汇总 ({elapsed:.1f}s):")
         logger.info(f"   总计: {len(all_items)} → 去重后: {len(unique_items)}")
@@ -1154,38 +1824,52 @@ class CrawlOrchestrator:
         # 保存原始数据
         if self.save_raw:
             self._save_raw(unique_items)
+            self._save_latency()
         
         return unique_items
 
     def _save_raw(self, items: List[RawContent]):
-        """保存原始采集数据（用于趋势分析时间序列）"""
+        """
+        保存原始采集数据（用于趋势分析时间序列）
+        
+        JSONL 格式：首行为 {'crawl_time', 'total'} 头信息，之后每行一条内容，
+        逐条序列化写出，不在内存中拼出整个文档
+        """
         self.raw_dir.mkdir(parents=True, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filepath = self.raw_dir / f"raw_{timestamp}.json"
+        filepath = self.raw_dir / f"raw_{timestamp}.jsonl"
         
-        data = {
+        header = {
             'crawl_time': datetime.now(timezone.utc).isoformat(),
             'total': len(items),
-            'items': [item.to_dict() for item in items]
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps(header) + b'\n')
+            for item in items:
+                f.write(_json_dumps(item) + b'\n')
         
-        # 清理7天前的原始数据
-        cutoff = datetime.now() - timedelta(days=7)
-        for old_file in self.raw_dir.glob('raw_*.json'):
-            try:
-                fdate_str = old_file.stem.replace('raw_', '')
-                fdate = datetime.strptime(fdate_str, '%Y%m%d_%H%M%S')
-                if fdate < cutoff:
-                    old_file.unlink()
-            except (ValueError, OSError):
-                pass
+        # 按概率清理过期数据，不必每次采集都扫描目录
+        if random.random() < RAW_CLEANUP_PROBABILITY:
+            self._cleanup_raw()
         
         logger.info(f"  💾 原始数据保存: {filepath.name}")
 
+    def _cleanup_raw(self):
+        """清理7天前的原始数据 (含旧版 .json 文件)"""
+        # 文件名中的时间戳 YYYYMMDD_HHMMSS 按字典序即按时间排序，直接比较字符串
+        # (不用 mtime: 数据目录随仓库提交，检出后 mtime 都是检出时间)
+        cutoff = (datetime.now() - timedelta(days=RAW_RETENTION_DAYS)).strftime('raw_%Y%m%d_%H%M%S')
+        with os.scandir(self.raw_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('raw_') and name[:19] < cutoff:
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+
 
 # ================================
 # 模块导出
@@ -1194,7 +1878,7 @@ __all__ = [
     'RawContent', 'CrawlOrchestrator',
     'DouyinCrawler', 'XiaohongshuCrawler',
     'WeiboCrawler', 'BilibiliCrawler', 'ZhihuCrawler', 'BaiduCrawler',
-    'SEED_KEYWORDS', 'UA_POOL', 'RateLimiter',
+    'SEED_KEYWORDS', 'ALL_SEED_KEYWORDS', 'UA_POOL', 'RateLimiter',
 ]
 
 if __name__ == '__main__':
@@ -8,16 +8,51 @@ import json
 import os
 import re
 import hashlib
+import heapq
+import functools
 import time
+import threading
 import traceback
+from email.utils import parsedate_to_datetime
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from urllib.parse import urlsplit
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from dedup import simhash, SimHashIndex
+
+try:
+    from lxml import etree as lxml_etree  # 可选: C 实现的 XML 解析，RSS 2.0 源不经过 feedparser
+except ImportError:
+    lxml_etree = None
+
+try:
+    from dateutil import parser as dateutil_parser  # 可选: 兜底解析非标准日期格式
+except ImportError:
+    dateutil_parser = None
+
+try:
+    import ahocorasick  # 可选: Aho-Corasick 自动机，重要性与地区关键词一次扫描
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # 可选: C 实现的 JSON 编解码，读写 news.json 更快
+except ImportError:
+    orjson = None
+
 # ==================== 配置 ====================
 DATA_DIR = Path(__file__).parent.parent / "data"
 OUTPUT_FILE = DATA_DIR / "news.json"
+FEED_CACHE_FILE = DATA_DIR / "cache" / "feed_cache.json"  # RSS 条件请求缓存 (ETag / Last-Modified + 上次解析结果)
+FEED_CACHE_MAX_AGE = 7 * 24 * 3600  # 超过该时长 (秒) 未再确认过的缓存条目丢弃
 MAX_NEWS = 300  # 最多保留条数
+LOOP_GC_ROUNDS = 10  # 循环模式每隔多少轮主动做一次完整垃圾回收
+NEWS_DEBUG = bool(os.environ.get('NEWS_DEBUG'))  # 调试时 news.json 缩进输出，便于阅读
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'  # 共享 Session 的默认 UA
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'  # 需要完整浏览器 UA 的平台 (抖音、小红书)
+MAX_CONNECTIONS_PER_HOST = 4  # 同一域名同时进行的请求上限 (多个源同站时排队，避免突发并发被限流)
+MAX_FETCH_WORKERS = 32  # 并发抓取线程上限 (抓取以等待网络为主，源数不超过上限时全部同时发出)
 
 # RSS 源配置
 RSS_SOURCES = [
@@ -183,109 +218,233 @@ RSS_SOURCES = [
 
 # ==================== 工具函数 ====================
 
+# clean_html 用到的正则 (模块加载时编译一次)
+_TAG_RE = re.compile(r'<[^>]+>')
+# 实体 (命名/数字) 与空白连成的一段整体替换为一个空格：一次扫描完成“实体转空格 + 合并空白”
+_ENTITY_WS_RE = re.compile(r'(?:&(?:[a-zA-Z]+|#\d+);|\s)+')
+# 去重键用：删除空白字符 (与 \s 覆盖的 Unicode 空白一致)，str.translate 比正则替换快
+_WS_TRANS = str.maketrans('', '', ' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\x85\xa0\u1680'
+                                   '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+                                   '\u2028\u2029\u202f\u205f\u3000')
+
+def json_loads(raw):
+    """解析 JSON 字节串或字符串 (优先 orjson)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def json_dumps(obj, indent=False):
+    """序列化为 UTF-8 JSON 字节串 (优先 orjson)，indent=True 时缩进 2 格"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def write_atomic(path, data):
+    """
+    原子写入文件
+    先写入同目录临时文件并 fsync，再 os.replace 覆盖目标文件，
+    进程中途退出或前端并发读取时不会留下/读到写了一半的 JSON。
+    临时文件名带进程/线程 ID，fetch_news 与 discover_trends 同时写 news.json 时互不覆盖
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """
+    获取共享的 requests.Session (RSS、国内热搜、翻译接口共用)
+    同一域名的多次请求 (Reuters、BBC 等多个源) 复用已建立的 TCP/TLS 连接，
+    连接池大小与抓取线程数一致，并发时不会因池满而丢弃连接；
+    只在建立连接失败时重试 2 次；读超时、错误状态码不重试，
+    卡住的源 timeout 后即失败，不会拖长整轮抓取
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS,
+                                  max_retries=Retry(total=2, connect=2, read=0, status=0,
+                                                    backoff_factor=0.3))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            _session = session
+        return _session
+
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+def host_slot(url):
+    """
+    该 URL 所在域名的并发名额 (BoundedSemaphore，上限 MAX_CONNECTIONS_PER_HOST)
+    用法: with host_slot(url): ...
+    """
+    host = urlsplit(url).hostname or ''
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST)
+        return slot
+
 def clean_html(text):
     """去除HTML标签"""
     if not text:
         return ""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'&[a-zA-Z]+;', ' ', text)
-    text = re.sub(r'&#\d+;', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    # 标签须先整体删掉，标签两侧的空白才能合并成一个
+    text = _ENTITY_WS_RE.sub(' ', _TAG_RE.sub('', text)).strip()
     return text[:500]  # 限制长度
 
 def make_id(title, source):
-    """生成唯一ID"""
+    """生成唯一ID (非加密用途，blake2b 直接输出 6 字节 = 12 位十六进制)"""
+    return hashlib.blake2b(f"{title}_{source}".encode('utf-8'), digest_size=6).hexdigest()
+
+def legacy_make_id(title, source):
+    """旧版 ID (md5 前 12 位)，仅用于识别 news.json 中旧格式 ID 的同一条新闻"""
     raw = f"{title}_{source}"
     return hashlib.md5(raw.encode()).hexdigest()[:12]
 
 def parse_date(date_str):
-    """解析各种日期格式"""
-    if not date_str:
-        return datetime.now(timezone.utc).isoformat()
-    
-    formats = [
-        "%a, %d %b %Y %H:%M:%S %z",
-        "%a, %d %b %Y %H:%M:%S %Z",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%dT%H:%M:%S.%fZ",
-    ]
-    
-    for fmt in formats:
+    """解析各种日期格式，返回 ISO 字符串"""
+    return parse_datetime(date_str).isoformat()
+
+def parse_datetime(date_str):
+    """解析各种日期格式，返回带时区的 datetime (无法解析时为当前时间)"""
+    dt = _parse_datetime_cached(date_str.strip()) if date_str else None
+    return dt if dt is not None else datetime.now(timezone.utc)
+
+@functools.lru_cache(maxsize=2048)
+def _parse_datetime_cached(date_str):
+    """
+    解析日期字符串，无法解析时返回 None
+    同一源的条目常共用同一时间串，结果按字符串缓存；“当前时间”兜底不进缓存
+    """
+    dt = None
+    if date_str[:1].isalpha():
+        # RFC 822/2822 (RSS 的 pubDate): "Mon, 02 Jan 2006 15:04:05 +0000" / "... GMT"
+        try:
+            dt = parsedate_to_datetime(date_str)
+        except (TypeError, ValueError):
+            pass
+    else:
+        # ISO 8601 (Atom / API): "2006-01-02T15:04:05Z"、"2006-01-02 15:04:05" 等
         try:
-            dt = datetime.strptime(date_str.strip(), fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.isoformat()
+            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
         except ValueError:
-            continue
-    
-    # fallback: try dateutil
-    try:
-        from dateutil import parser as dateutil_parser
-        dt = dateutil_parser.parse(date_str)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.isoformat()
-    except:
-        return datetime.now(timezone.utc).isoformat()
-
-def classify_importance(title, summary):
-    """根据关键词判断重要性 1-5"""
-    text = f"{title} {summary}".lower()
-    
-    # 重大事件关键词
-    critical = ['war', 'invasion', 'nuclear', 'crash', 'crisis', 'emergency', 'breaking',
-                 '战争', '核', '崩盘', '危机', '紧急', '突发', '重大', '地震', '海啸']
-    high = ['summit', 'sanctions', 'election', 'fed', 'interest rate', 'gdp', 'inflation',
-            'trump', 'biden', 'xi jinping', 'putin',
-            '峰会', '制裁', '选举', '央行', '利率', 'GDP', '通胀', '关税', '贸易战',
-            '习近平', '普京', '特朗普', '拜登', '两会', '政策']
-    medium = ['trade', 'market', 'stock', 'oil', 'gold', 'bitcoin',
-              '贸易', '市场', '股市', '石油', '黄金', '比特币', '科技', '芯片']
-    
-    score = 3  # default medium
-    for kw in critical:
-        if kw in text:
-            score = 5
-            break
-    if score < 5:
-        for kw in high:
-            if kw in text:
-                score = 4
-                break
-    if score < 4:
-        for kw in medium:
-            if kw in text:
-                score = 3
-                break
-    
-    return score
-
-def detect_region(title, summary, source_name):
-    """检测新闻涉及的地区"""
-    text = f"{title} {summary} {source_name}".lower()
-    
-    regions = []
-    region_map = {
-        '中国': ['china', 'chinese', 'beijing', 'shanghai', '中国', '北京', '上海', '习近平', '新华', '澎湃', '财新'],
-        '美国': ['us', 'usa', 'america', 'washington', 'trump', 'biden', 'fed', 'wall street', '美国', '华盛顿', '美联储'],
-        '欧洲': ['europe', 'eu', 'european', 'brussels', 'london', 'paris', 'berlin', '欧洲', '欧盟', '英国', '法国', '德国'],
-        '俄罗斯': ['russia', 'russian', 'moscow', 'putin', 'kremlin', '俄罗斯', '莫斯科', '普京'],
-        '中东': ['middle east', 'israel', 'iran', 'saudi', 'gaza', 'syria', '中东', '以色列', '伊朗', '沙特'],
-        '亚太': ['japan', 'korea', 'india', 'asean', 'asia', 'pacific', '日本', '韩国', '印度', '东盟', '亚洲'],
-        '全球': ['global', 'world', 'international', 'un ', 'united nations', '全球', '世界', '联合国'],
-    }
-    
-    for region, keywords in region_map.items():
+            pass
+    if dt is None and dateutil_parser is not None:
+        # fallback: try dateutil
+        try:
+            dt = dateutil_parser.parse(date_str)
+        except (ValueError, OverflowError):
+            pass
+    if dt is not None and dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+# 重要性关键词
+IMPORTANCE_CRITICAL = ['war', 'invasion', 'nuclear', 'crash', 'crisis', 'emergency', 'breaking',
+                       '战争', '核', '崩盘', '危机', '紧急', '突发', '重大', '地震', '海啸']
+IMPORTANCE_HIGH = ['summit', 'sanctions', 'election', 'fed', 'interest rate', 'gdp', 'inflation',
+                   'trump', 'biden', 'xi jinping', 'putin',
+                   '峰会', '制裁', '选举', '央行', '利率', 'GDP', '通胀', '关税', '贸易战',
+                   '习近平', '普京', '特朗普', '拜登', '两会', '政策']
+IMPORTANCE_MEDIUM = ['trade', 'market', 'stock', 'oil', 'gold', 'bitcoin',
+                     '贸易', '市场', '股市', '石油', '黄金', '比特币', '科技', '芯片']
+
+def _keyword_re(keywords):
+    """把关键词列表编译为一个字面量多选正则 (一次扫描即可判断是否命中任一关键词)"""
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+_CRITICAL_RE = _keyword_re(IMPORTANCE_CRITICAL)
+_HIGH_RE = _keyword_re(IMPORTANCE_HIGH)
+
+def item_text(title, summary=''):
+    """classify_importance / detect_region 共用的小写文本 (每条新闻只拼接、转小写一次)"""
+    return f"{title} {summary}".lower()
+
+def classify_importance(text_lc):
+    """根据关键词判断重要性 1-5 (text_lc: item_text 生成的小写文本)"""
+    if _CRITICAL_RE.search(text_lc):
+        return 5
+    if _HIGH_RE.search(text_lc):
+        return 4
+    # 命中 IMPORTANCE_MEDIUM 与未命中结果相同 (默认即为中等)，无需扫描
+    return 3
+
+# 地区 → 关键词
+REGION_KEYWORDS = {
+    '中国': ['china', 'chinese', 'beijing', 'shanghai', '中国', '北京', '上海', '习近平', '新华', '澎湃', '财新'],
+    '美国': ['us', 'usa', 'america', 'washington', 'trump', 'biden', 'fed', 'wall street', '美国', '华盛顿', '美联储'],
+    '欧洲': ['europe', 'eu', 'european', 'brussels', 'london', 'paris', 'berlin', '欧洲', '欧盟', '英国', '法国', '德国'],
+    '俄罗斯': ['russia', 'russian', 'moscow', 'putin', 'kremlin', '俄罗斯', '莫斯科', '普京'],
+    '中东': ['middle east', 'israel', 'iran', 'saudi', 'gaza', 'syria', '中东', '以色列', '伊朗', '沙特'],
+    '亚太': ['japan', 'korea', 'india', 'asean', 'asia', 'pacific', '日本', '韩国', '印度', '东盟', '亚洲'],
+    '全球': ['global', 'world', 'international', 'un ', 'united nations', '全球', '世界', '联合国'],
+}
+
+# 每个地区一个多选正则：不同地区的关键词可能互相重叠 (如 russia 包含 us)，
+# 合成一个正则用 finditer 会被先匹配的关键词吞掉，按地区分别搜索才与逐词查找等价
+_REGION_RES = [(region, _keyword_re(keywords)) for region, keywords in REGION_KEYWORDS.items()]
+
+def detect_region(text_lc, source_name):
+    """检测新闻涉及的地区 (text_lc: item_text 生成的小写文本)"""
+    text = f"{text_lc} {source_name.lower()}"
+    regions = [region for region, pattern in _REGION_RES if pattern.search(text)]
+    return regions if regions else ['其他']
+
+def _build_keyword_automaton():
+    """把重要性与地区关键词编进同一个自动机：关键词 → (重要性, 地区集合)"""
+    tags = {}
+    for level, keywords in ((5, IMPORTANCE_CRITICAL), (4, IMPORTANCE_HIGH)):
         for kw in keywords:
-            if kw in text:
-                regions.append(region)
-                break
+            tags.setdefault(kw, [0, set()])
+            tags[kw][0] = max(tags[kw][0], level)
+    for region, keywords in REGION_KEYWORDS.items():
+        for kw in keywords:
+            tags.setdefault(kw, [0, set()])[1].add(region)
     
-    return regions if regions else ['其他']
+    automaton = ahocorasick.Automaton()
+    for kw, (level, regions) in tags.items():
+        automaton.add_word(kw, (level, frozenset(regions)))
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick is not None else None
+
+def classify_item(text_lc, source_name):
+    """
+    同时判断重要性与地区，结果与 classify_importance + detect_region 相同
+    装了 pyahocorasick 时只扫描一遍文本；重要性只统计落在 text_lc 内的命中 (不含来源名)
+    """
+    if _KEYWORD_AUTOMATON is None:
+        return classify_importance(text_lc), detect_region(text_lc, source_name)
+    
+    text = f"{text_lc} {source_name.lower()}"
+    last_text_index = len(text_lc) - 1
+    importance = 3
+    found = set()
+    for end, (level, regions) in _KEYWORD_AUTOMATON.iter(text):
+        if level > importance and end <= last_text_index:
+            importance = level
+        found |= regions
+    regions = [region for region in REGION_KEYWORDS if region in found]
+    return importance, regions if regions else ['其他']
 
 # ==================== 翻译 (SiliconFlow/DeepSeek AI) ====================
 
@@ -293,9 +452,12 @@ TRANSLATE_API_URL = os.environ.get('TRANSLATE_API_URL', 'https://api.siliconflow
 TRANSLATE_API_KEY = os.environ.get('TRANSLATE_API_KEY', '')
 TRANSLATE_MODEL = os.environ.get('TRANSLATE_MODEL', 'deepseek-ai/DeepSeek-V3')
 
+_CN_CHAR_RE = re.compile(r'[\u4e00-\u9fff]')
+# 译文行: "1. 翻译内容" / "1、翻译内容" / "1.翻译内容"
+_NUMBERED_LINE_RE = re.compile(r'^(\d+)\s*[.、．]\s*(.+)')
+
 def ai_translate_batch(texts, batch_size=20):
     """用AI大模型批量翻译英文为中文"""
-    import requests as req
     
     if not TRANSLATE_API_KEY:
         print("  ⚠️ 未设置 TRANSLATE_API_KEY 环境变量，跳过翻译")
@@ -308,7 +470,7 @@ def ai_translate_batch(texts, batch_size=20):
     for i, t in enumerate(texts):
         if not t or not t.strip():
             continue
-        cn_chars = len(re.findall(r'[\u4e00-\u9fff]', t))
+        cn_chars = len(_CN_CHAR_RE.findall(t))
         if cn_chars > len(t) * 0.3:
             continue  # 已经是中文
         to_translate.append((i, t[:300]))
@@ -335,7 +497,7 @@ def ai_translate_batch(texts, batch_size=20):
 5. 专业术语用常见中文表达"""
         
         try:
-            resp = req.post(TRANSLATE_API_URL, 
+            resp = get_session().post(TRANSLATE_API_URL, 
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {TRANSLATE_API_KEY}'
@@ -352,7 +514,7 @@ def ai_translate_batch(texts, batch_size=20):
                 timeout=30
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = json_loads(resp.content)
             reply = data.get('choices', [{}])[0].get('message', {}).get('content', '')
             
             # 解析翻译结果
@@ -362,7 +524,7 @@ def ai_translate_batch(texts, batch_size=20):
                 if not line:
                     continue
                 # 匹配 "1. 翻译内容" 或 "1、翻译内容" 或 "1.翻译内容"
-                m = re.match(r'^(\d+)\s*[.、．]\s*(.+)', line)
+                m = _NUMBERED_LINE_RE.match(line)
                 if m:
                     num = int(m.group(1)) - 1
                     translated = m.group(2).strip()
@@ -414,19 +576,27 @@ def translate_items(items):
 
 # ==================== RSS 抓取 ====================
 
-def fetch_sina_finance(source, resp):
-    """解析新浪财经API"""
+# JSONP 包装: 可选的回调名 + ( ... ) + 可选分号
+_JSONP_RE = re.compile(rb'^[^({]*\((.*)\)\s*;?\s*$', re.S)
+
+def fetch_sina_finance(source, body, now_iso=None):
+    """解析新浪财经API 的响应正文 body (now_iso: 本轮抓取共用的抓取时间)"""
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
     items = []
     try:
-        text = resp.text.strip()
-        # Remove JSONP callback if present
-        if text.startswith('('):
-            text = text[1:-1]
-        data = json.loads(text)
+        body = body.strip()
+        # URL 里 callback 为空时直接返回 JSON；万一返回 JSONP 再剥掉回调包装
+        if not body.startswith(b'{'):
+            m = _JSONP_RE.match(body)
+            if m:
+                body = m.group(1)
+        data = json_loads(body)
         for entry in (data.get('result', {}).get('data', []))[:20]:
             title = entry.get('title', '')
             if not title:
                 continue
+            pub_dt = parse_datetime(entry.get('ctime', '') or entry.get('createTime', ''))
+            importance, regions = classify_item(item_text(title, entry.get('intro', '')), source['name'])
             items.append({
                 'id': make_id(title, source['name']),
                 'title': title,
@@ -437,10 +607,11 @@ def fetch_sina_finance(source, resp):
                 'category': source['category'],
                 'lang': source['lang'],
                 'image': entry.get('img', {}).get('u', '') if isinstance(entry.get('img'), dict) else '',
-                'pub_date': parse_date(entry.get('ctime', '') or entry.get('createTime', '')),
-                'fetch_time': datetime.now(timezone.utc).isoformat(),
-                'importance': classify_importance(title, entry.get('intro', '')),
-                'regions': detect_region(title, entry.get('intro', ''), source['name']),
+                'pub_date': pub_dt.isoformat(),
+                '_pub_ts': pub_dt.timestamp(),
+                'fetch_time': now_iso,
+                'importance': importance,
+                'regions': regions,
                 'priority': source['priority'],
             })
         print(f"  ✅ {source['name']}: {len(items)} 条")
@@ -450,20 +621,25 @@ def fetch_sina_finance(source, resp):
 
 # ==================== 国内热搜平台抓取 ====================
 
-def fetch_douyin_hot():
-    """抓取抖音热搜榜"""
-    import requests as req
+# 页面内嵌的 SSR 初始数据
+_36KR_STATE_RE = re.compile(r'window\.initialState\s*=\s*({.+?})\s*</script>', re.DOTALL)
+_XHS_STATE_RE = re.compile(r'window\.__INITIAL_STATE__\s*=\s*(.+?)</script>', re.DOTALL)
+
+def fetch_douyin_hot(now_iso=None):
+    """抓取抖音热搜榜 (now_iso: 本轮抓取共用的抓取时间)"""
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+    now_ts = datetime.fromisoformat(now_iso).timestamp()
     items = []
     name = '抖音热搜'
     icon = '🎵'
     try:
-        r = req.get('https://www.douyin.com/aweme/v1/web/hot/search/list/',
+        r = get_session().get('https://www.douyin.com/aweme/v1/web/hot/search/list/',
             headers={
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'User-Agent': BROWSER_USER_AGENT,
                 'Referer': 'https://www.douyin.com/'
             }, timeout=15)
         r.raise_for_status()
-        data = r.json()
+        data = json_loads(r.content)
         word_list = data.get('data', {}).get('word_list', [])
         
         for entry in word_list[:30]:
@@ -480,7 +656,8 @@ def fetch_douyin_hot():
             elif hot_value > 5000000:
                 importance = 4
             
-            pub_date = datetime.fromtimestamp(event_time, tz=timezone.utc).isoformat() if event_time else datetime.now(timezone.utc).isoformat()
+            pub_ts = event_time or now_ts
+            pub_date = datetime.fromtimestamp(pub_ts, tz=timezone.utc).isoformat()
             
             # 智能分类
             category = auto_classify_cn(title)
@@ -496,9 +673,10 @@ def fetch_douyin_hot():
                 'lang': 'zh',
                 'image': '',
                 'pub_date': pub_date,
-                'fetch_time': datetime.now(timezone.utc).isoformat(),
+                '_pub_ts': pub_ts,
+                'fetch_time': now_iso,
                 'importance': importance,
-                'regions': detect_region(title, '', name),
+                'regions': detect_region(item_text(title), name),
                 'priority': 1,
                 'hot_value': hot_value,
             })
@@ -507,18 +685,17 @@ def fetch_douyin_hot():
         print(f"  ❌ {name}: {str(e)[:80]}")
     return items
 
-def fetch_toutiao_hot():
-    """抓取今日头条热榜"""
-    import requests as req
+def fetch_toutiao_hot(now_iso=None):
+    """抓取今日头条热榜 (now_iso: 本轮抓取共用的抓取时间)"""
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+    now_ts = datetime.fromisoformat(now_iso).timestamp()
     items = []
     name = '今日头条'
     icon = '📱'
     try:
-        r = req.get('https://www.toutiao.com/hot-event/hot-board/?origin=toutiao_pc',
-            headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'},
-            timeout=15)
+        r = get_session().get('https://www.toutiao.com/hot-event/hot-board/?origin=toutiao_pc', timeout=15)
         r.raise_for_status()
-        data = r.json()
+        data = json_loads(r.content)
         entries = data.get('data', [])
         
         for i, entry in enumerate(entries[:30]):
@@ -553,10 +730,11 @@ def fetch_toutiao_hot():
                 'category': category,
                 'lang': 'zh',
                 'image': '',
-                'pub_date': datetime.now(timezone.utc).isoformat(),
-                'fetch_time': datetime.now(timezone.utc).isoformat(),
+                'pub_date': now_iso,
+                '_pub_ts': now_ts,
+                'fetch_time': now_iso,
                 'importance': importance,
-                'regions': detect_region(title, '', name),
+                'regions': detect_region(item_text(title), name),
                 'priority': 1,
                 'hot_value': hot_value,
             })
@@ -565,25 +743,24 @@ def fetch_toutiao_hot():
         print(f"  ❌ {name}: {str(e)[:80]}")
     return items
 
-def fetch_36kr_newsflash():
-    """抓取36氪快讯（财经科技）"""
-    import requests as req
+def fetch_36kr_newsflash(now_iso=None):
+    """抓取36氪快讯（财经科技） (now_iso: 本轮抓取共用的抓取时间)"""
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+    now_ts = datetime.fromisoformat(now_iso).timestamp()
     items = []
     name = '36氪快讯'
     icon = '💼'
     try:
-        r = req.get('https://36kr.com/newsflashes',
-            headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'},
-            timeout=15)
+        r = get_session().get('https://36kr.com/newsflashes', timeout=15)
         r.raise_for_status()
         
-        m = re.search(r'window\.initialState\s*=\s*({.+?})\s*</script>', r.text, re.DOTALL)
+        m = _36KR_STATE_RE.search(r.text)
         if not m:
             print(f"  ❌ {name}: 无法解析页面数据")
             return items
         
         raw = m.group(1)
-        data = json.loads(raw)
+        data = json_loads(raw)
         flash_list = data.get('newsflashCatalogData', {}).get('data', {}).get('newsflashList', {}).get('data', {}).get('itemList', [])
         
         for entry in flash_list[:20]:
@@ -595,12 +772,14 @@ def fetch_36kr_newsflash():
             pub_time = mat.get('publishTime', 0)
             item_id = mat.get('itemId', '')
             
-            pub_date = datetime.fromtimestamp(pub_time / 1000, tz=timezone.utc).isoformat() if pub_time > 1000000000 else datetime.now(timezone.utc).isoformat()
+            pub_ts = pub_time / 1000 if pub_time > 1000000000 else now_ts
+            pub_date = datetime.fromtimestamp(pub_ts, tz=timezone.utc).isoformat()
             
             # 36氪主要是财经科技
             category = auto_classify_cn(title + ' ' + summary)
             if category == '时事':
                 category = '财经'  # 36氪偏向财经
+            importance, regions = classify_item(item_text(title, summary), name)
             
             items.append({
                 'id': make_id(title, name),
@@ -613,9 +792,10 @@ def fetch_36kr_newsflash():
                 'lang': 'zh',
                 'image': '',
                 'pub_date': pub_date,
-                'fetch_time': datetime.now(timezone.utc).isoformat(),
-                'importance': classify_importance(title, summary),
-                'regions': detect_region(title, summary, name),
+                '_pub_ts': pub_ts,
+                'fetch_time': now_iso,
+                'importance': importance,
+                'regions': regions,
                 'priority': 1,
             })
         print(f"  ✅ {name}: {len(items)} 条")
@@ -623,25 +803,26 @@ def fetch_36kr_newsflash():
         print(f"  ❌ {name}: {str(e)[:80]}")
     return items
 
-def fetch_xiaohongshu_explore():
-    """抓取小红书探索热门内容"""
-    import requests as req
+def fetch_xiaohongshu_explore(now_iso=None):
+    """抓取小红书探索热门内容 (now_iso: 本轮抓取共用的抓取时间)"""
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+    now_ts = datetime.fromisoformat(now_iso).timestamp()
     items = []
     name = '小红书热门'
     icon = '📕'
     try:
-        r = req.get('https://www.xiaohongshu.com/explore',
-            headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'},
+        r = get_session().get('https://www.xiaohongshu.com/explore',
+            headers={'User-Agent': BROWSER_USER_AGENT},
             timeout=15)
         r.raise_for_status()
         
-        m = re.search(r'window\.__INITIAL_STATE__\s*=\s*(.+?)</script>', r.text, re.DOTALL)
+        m = _XHS_STATE_RE.search(r.text)
         if not m:
             print(f"  ❌ {name}: 无法解析页面数据")
             return items
         
         raw = m.group(1).strip().rstrip(';').replace('undefined', 'null')
-        data = json.loads(raw)
+        data = json_loads(raw)
         feeds = data.get('feed', {}).get('feeds', [])
         
         for entry in feeds[:20]:
@@ -678,10 +859,11 @@ def fetch_xiaohongshu_explore():
                 'category': category,
                 'lang': 'zh',
                 'image': '',
-                'pub_date': datetime.now(timezone.utc).isoformat(),
-                'fetch_time': datetime.now(timezone.utc).isoformat(),
+                'pub_date': now_iso,
+                '_pub_ts': now_ts,
+                'fetch_time': now_iso,
                 'importance': importance,
-                'regions': detect_region(title, '', name),
+                'regions': detect_region(item_text(title), name),
                 'priority': 2,
             })
         print(f"  ✅ {name}: {len(items)} 条")
@@ -689,115 +871,300 @@ def fetch_xiaohongshu_explore():
         print(f"  ❌ {name}: {str(e)[:80]}")
     return items
 
+# 国内热搜分类 → 关键词 (按顺序判断，先命中的分类优先；区分大小写)
+CN_CATEGORY_KEYWORDS = [
+    ('财经', ['股', '基金', '理财', '投资', '财经', '上市', '涨停', '跌停', '市值', 
+              'A股', '港股', '美股', '债券', '期货', '外汇', '央行', '利率', '通胀',
+              'GDP', '经济', '金融', '银行', '保险', '证券', '融资', '资本', '估值',
+              '营收', '利润', '回购', '分红', '减持', '增持', '收购', '并购', '上涨',
+              '下跌', '牛市', '熊市', '交易', '资金', '指数', '板块', '概念股', '市场',
+              '消费', '零售', '出口', '进口', '税', '油价', '金价', '比特币', '数字货币']),
+    ('政治', ['政治', '政府', '国务院', '全国人大', '政协', '两会', '总书记', '主席',
+              '总统', '选举', '外交', '制裁', '条约', '法案', '立法', '法院', '政策',
+              '改革', '一带一路', '台湾', '南海', '国防', '军事', '部队']),
+    ('科技', ['AI', '人工智能', '芯片', '半导体', '5G', '6G', '机器人', '自动驾驶',
+              '大模型', '算法', 'ChatGPT', '量子', '航天', '火箭', '卫星', '科技',
+              '互联网', '手机', '苹果', '华为', '特斯拉', '新能源', '电池', '光伏',
+              '生物', '医药', '疫苗', '基因', 'Kimi', 'DeepSeek', '千问']),
+    ('国际', ['美国', '俄罗斯', '欧洲', '日本', '韩国', '朝鲜', '中东', '以色列',
+              '乌克兰', '北约', '联合国', '国际', '全球', '海外', '出海']),
+]
+_CN_CATEGORY_RES = [(category, _keyword_re(keywords)) for category, keywords in CN_CATEGORY_KEYWORDS]
+
+def _build_cn_category_automaton():
+    """关键词 → 所属分类中最靠前的序号 (序号越小优先级越高)"""
+    automaton = ahocorasick.Automaton()
+    for rank, (_, keywords) in reversed(list(enumerate(CN_CATEGORY_KEYWORDS))):
+        for kw in keywords:
+            automaton.add_word(kw, rank)
+    automaton.make_automaton()
+    return automaton
+
+_CN_CATEGORY_AUTOMATON = _build_cn_category_automaton() if ahocorasick is not None else None
+
 def auto_classify_cn(text):
-    """中文内容智能分类"""
-    finance_kw = ['股', '基金', '理财', '投资', '财经', '上市', '涨停', '跌停', '市值', 
-                  'A股', '港股', '美股', '债券', '期货', '外汇', '央行', '利率', '通胀',
-                  'GDP', '经济', '金融', '银行', '保险', '证券', '融资', '资本', '估值',
-                  '营收', '利润', '回购', '分红', '减持', '增持', '收购', '并购', '上涨',
-                  '下跌', '牛市', '熊市', '交易', '资金', '指数', '板块', '概念股', '市场',
-                  '消费', '零售', '出口', '进口', '税', '油价', '金价', '比特币', '数字货币']
-    politics_kw = ['政治', '政府', '国务院', '全国人大', '政协', '两会', '总书记', '主席',
-                   '总统', '选举', '外交', '制裁', '条约', '法案', '立法', '法院', '政策',
-                   '改革', '一带一路', '台湾', '南海', '国防', '军事', '部队']
-    tech_kw = ['AI', '人工智能', '芯片', '半导体', '5G', '6G', '机器人', '自动驾驶',
-               '大模型', '算法', 'ChatGPT', '量子', '航天', '火箭', '卫星', '科技',
-               '互联网', '手机', '苹果', '华为', '特斯拉', '新能源', '电池', '光伏',
-               '生物', '医药', '疫苗', '基因', 'Kimi', 'DeepSeek', '千问']
-    intl_kw = ['美国', '俄罗斯', '欧洲', '日本', '韩国', '朝鲜', '中东', '以色列',
-               '乌克兰', '北约', '联合国', '国际', '全球', '海外', '出海']
-    
-    for kw in finance_kw:
-        if kw in text:
-            return '财经'
-    for kw in politics_kw:
-        if kw in text:
-            return '政治'
-    for kw in tech_kw:
-        if kw in text:
-            return '科技'
-    for kw in intl_kw:
-        if kw in text:
-            return '国际'
+    """中文内容智能分类 (装了 pyahocorasick 时一次扫描所有分类的关键词)"""
+    if _CN_CATEGORY_AUTOMATON is not None:
+        best = len(CN_CATEGORY_KEYWORDS)
+        for _, rank in _CN_CATEGORY_AUTOMATON.iter(text):
+            if rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return CN_CATEGORY_KEYWORDS[best][0] if best < len(CN_CATEGORY_KEYWORDS) else '时事'
+    
+    for category, pattern in _CN_CATEGORY_RES:
+        if pattern.search(text):
+            return category
     return '时事'
 
 # ==================== RSS 抓取 ====================
 
-def fetch_single_rss(source):
-    """抓取单个RSS源"""
+MAX_FEED_ENTRIES = 20  # 每个源最多取的条数
+MAX_FEED_BYTES = 5 * 1024 * 1024  # 单个源正文读取上限 (解压后)，超出部分丢弃
+
+# RSS 扩展命名空间
+_NS_MEDIA = '{http://search.yahoo.com/mrss/}'
+_NS_CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+_NS_DC_DATE = '{http://purl.org/dc/elements/1.1/}date'
+_NS_ATOM = '{http://www.w3.org/2005/Atom}'
+
+if lxml_etree is not None:
+    # 不解析外部实体、不访问网络
+    _LXML_PARSER = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+
+def _media_image(node):
+    """Media RSS 图片 (media:content 优先于 media:thumbnail)，没有时返回空串"""
+    media = node.find(_NS_MEDIA + 'content')
+    if media is None:
+        media = node.find(_NS_MEDIA + 'thumbnail')
+    return media.get('url', '') if media is not None else ''
+
+def _feed_entry(title, summary, link, date_str, image):
+    """组装与 _feed_entries_feedparser 相同结构的条目 (发布时间与 feedparser 一样统一为 UTC)"""
+    pub_dt = parse_datetime(date_str).astimezone(timezone.utc)
+    return {
+        'title': title,
+        'summary': summary,
+        'link': link,
+        'pub_date': pub_dt.isoformat(),
+        'pub_ts': pub_dt.timestamp(),
+        'image': image,
+    }
+
+def _rss_entries(root):
+    """RSS 2.0: channel/item"""
+    entries = []
+    for item in root.iterfind('channel/item'):
+        if len(entries) >= MAX_FEED_ENTRIES:
+            break
+        
+        # 提取图片
+        image = _media_image(item)
+        if not image:
+            for enc in item.iterfind('enclosure'):
+                if 'image' in enc.get('type', ''):
+                    image = enc.get('url', '')
+                    break
+        
+        entries.append(_feed_entry(
+            item.findtext('title') or '',
+            item.findtext('description') or item.findtext(_NS_CONTENT_ENCODED) or '',
+            (item.findtext('link') or '').strip(),
+            item.findtext('pubDate') or item.findtext(_NS_DC_DATE) or '',
+            image,
+        ))
+    return entries
+
+def _atom_text(node):
+    """Atom 文本节点的内容 (type="xhtml" 时内容在子元素里，取全部文本)"""
+    return ''.join(node.itertext()) if node is not None else ''
+
+def _atom_entries(root):
+    """Atom 1.0: feed/entry"""
+    entries = []
+    for entry in root.iterfind(_NS_ATOM + 'entry'):
+        if len(entries) >= MAX_FEED_ENTRIES:
+            break
+        
+        # 正文链接取 rel="alternate" (缺省即 alternate)，图片可能在 rel="enclosure"
+        link = ''
+        image = _media_image(entry)
+        for node in entry.iterfind(_NS_ATOM + 'link'):
+            rel = node.get('rel', 'alternate')
+            if rel == 'alternate' and not link:
+                link = node.get('href', '')
+            elif rel == 'enclosure' and not image and 'image' in node.get('type', ''):
+                image = node.get('href', '')
+        
+        entries.append(_feed_entry(
+            _atom_text(entry.find(_NS_ATOM + 'title')),
+            _atom_text(entry.find(_NS_ATOM + 'summary')) or _atom_text(entry.find(_NS_ATOM + 'content')),
+            link.strip(),
+            entry.findtext(_NS_ATOM + 'published') or entry.findtext(_NS_ATOM + 'updated') or '',
+            image,
+        ))
+    return entries
+
+def _feed_entries_lxml(content):
+    """
+    用 lxml 解析 RSS 2.0 / Atom 1.0，返回条目列表
+    
+    RDF (RSS 1.0) 等其他格式或格式不规范的文档返回 None，交给 feedparser
+    """
+    try:
+        root = lxml_etree.fromstring(content, parser=_LXML_PARSER)
+    except lxml_etree.XMLSyntaxError:
+        return None
+    if root.tag == 'rss':
+        return _rss_entries(root)
+    if root.tag == _NS_ATOM + 'feed':
+        return _atom_entries(root)
+    return None
+
+def _feed_entries_feedparser(content):
+    """用 feedparser 解析任意格式的订阅源，返回条目列表"""
     import feedparser
-    import requests
     
+    feed = feedparser.parse(content)
+    entries = []
+    for entry in feed.entries[:MAX_FEED_ENTRIES]:
+        # feedparser 已把日期解析为 UTC 的 struct_time，只有缺失时才解析原始字符串
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed:
+            pub_dt = datetime(*parsed[:6], tzinfo=timezone.utc)
+        else:
+            pub_dt = parse_datetime(entry.get('published', '') or entry.get('updated', ''))
+        
+        # 提取图片
+        image = ''
+        if entry.get('media_content'):
+            image = entry['media_content'][0].get('url', '')
+        elif entry.get('media_thumbnail'):
+            image = entry['media_thumbnail'][0].get('url', '')
+        elif entry.get('enclosures'):
+            for enc in entry['enclosures']:
+                if 'image' in enc.get('type', ''):
+                    image = enc.get('href', '')
+                    break
+        
+        entries.append({
+            'title': entry.get('title', ''),
+            'summary': (entry.get('summary', '') or
+                        entry.get('description', '') or
+                        (entry['content'][0].get('value', '') if entry.get('content') else '')),
+            'link': entry.get('link', ''),
+            'pub_date': pub_dt.isoformat(),
+            'pub_ts': pub_dt.timestamp(),
+            'image': image,
+        })
+    return entries
+
+def load_feed_cache():
+    """读取 RSS 条件请求缓存 {url: {etag, last_modified, items, time}}，丢弃超过 FEED_CACHE_MAX_AGE 的条目"""
+    try:
+        feed_cache = json_loads(FEED_CACHE_FILE.read_bytes())
+    except:
+        return {}
+    cutoff = time.time() - FEED_CACHE_MAX_AGE
+    return {url: entry for url, entry in feed_cache.items() if entry.get('time', 0) >= cutoff}
+
+def save_feed_cache(feed_cache):
+    """保存 RSS 条件请求缓存 (只保留当前仍在 RSS_SOURCES 里的源)"""
+    urls = {src['url'] for src in RSS_SOURCES}
+    feed_cache = {url: entry for url, entry in feed_cache.items() if url in urls}
+    try:
+        FEED_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(FEED_CACHE_FILE, json_dumps(feed_cache))
+    except Exception as e:
+        print(f"  ⚠️ 保存 RSS 缓存失败: {e}")
+
+def fetch_single_rss(source, now_iso=None, feed_cache=None):
+    """
+    抓取单个RSS源
+    now_iso: 本轮抓取共用的抓取时间
+    feed_cache: RSS 条件请求缓存，传入时带 If-None-Match / If-Modified-Since，
+                源未更新 (304) 直接复用上次解析的条目
+    """
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
     items = []
     try:
-        # 使用requests获取内容（更好的超时控制）
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        resp = requests.get(source['url'], headers=headers, timeout=15)
-        resp.raise_for_status()
+        # 使用共享 Session 获取内容（更好的超时控制，复用连接）
+        headers = {}
+        cached = feed_cache.get(source['url']) if feed_cache is not None else None
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        # 流式读取：正文直接以 (解压后的) 字节交给解析器，且最多读 MAX_FEED_BYTES
+        with host_slot(source['url']), \
+                get_session().get(source['url'], headers=headers, timeout=15, stream=True) as resp:
+            if resp.status_code == 304 and cached:
+                cached['time'] = time.time()  # 服务端确认未变，续期
+                # 复用的条目与本轮新抓取的条目使用同一抓取时间
+                items = [{**item, 'fetch_time': now_iso} for item in cached['items']]
+                print(f"  ♻️ {source['name']}: 未更新，复用 {len(items)} 条")
+                return items
+            resp.raise_for_status()
+            body = resp.raw.read(MAX_FEED_BYTES, decode_content=True)
         
         # 新浪API特殊处理
         if source.get('type') == 'sina_api':
-            return fetch_sina_finance(source, resp)
+            return fetch_sina_finance(source, body, now_iso)
         
-        feed = feedparser.parse(resp.content)
+        entries = None
+        if lxml_etree is not None:
+            entries = _feed_entries_lxml(body)
+        if entries is None:
+            entries = _feed_entries_feedparser(body)
         
-        for entry in feed.entries[:20]:  # 每个源最多取20条
-            title = clean_html(entry.get('title', ''))
+        for entry in entries:
+            title = clean_html(entry['title'])
             if not title:
                 continue
             
-            summary = clean_html(
-                entry.get('summary', '') or 
-                entry.get('description', '') or 
-                entry.get('content', [{}])[0].get('value', '') if entry.get('content') else ''
-            )
-            
-            link = entry.get('link', '')
-            pub_date = entry.get('published', '') or entry.get('updated', '')
+            summary = clean_html(entry['summary'])
             
-            # 提取图片
-            image = ''
-            if entry.get('media_content'):
-                image = entry['media_content'][0].get('url', '')
-            elif entry.get('media_thumbnail'):
-                image = entry['media_thumbnail'][0].get('url', '')
-            elif entry.get('enclosures'):
-                for enc in entry['enclosures']:
-                    if 'image' in enc.get('type', ''):
-                        image = enc.get('href', '')
-                        break
-            
-            importance = classify_importance(title, summary)
-            regions = detect_region(title, summary, source['name'])
+            importance, regions = classify_item(item_text(title, summary), source['name'])
             
             item = {
                 'id': make_id(title, source['name']),
                 'title': title,
                 'summary': summary[:300],
-                'link': link,
+                'link': entry['link'],
                 'source': source['name'],
                 'source_icon': source['icon'],
                 'category': source['category'],
                 'lang': source['lang'],
-                'image': image,
-                'pub_date': parse_date(pub_date),
-                'fetch_time': datetime.now(timezone.utc).isoformat(),
+                'image': entry['image'],
+                'pub_date': entry['pub_date'],
+                '_pub_ts': entry['pub_ts'],
+                'fetch_time': now_iso,
                 'importance': importance,
                 'regions': regions,
                 'priority': source['priority'],
             }
             items.append(item)
         
+        if feed_cache is not None:
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+            if etag or last_modified:
+                feed_cache[source['url']] = {'etag': etag, 'last_modified': last_modified,
+                                             'items': items, 'time': time.time()}
+            else:
+                feed_cache.pop(source['url'], None)
+        
         print(f"  ✅ {source['name']}: {len(items)} 条")
     except Exception as e:
         print(f"  ❌ {source['name']}: {str(e)[:80]}")
     
     return items
 
-def fetch_all_news():
-    """并发抓取所有RSS源 + 国内热搜平台"""
+def fetch_all_news(now=None):
+    """并发抓取所有RSS源 + 国内热搜平台 (now: 本轮的参考时间，默认当前时间)"""
+    now = now or datetime.now(timezone.utc)
     cn_fetchers = [
         ('抖音热搜', fetch_douyin_hot),
         ('今日头条', fetch_toutiao_hot),
@@ -806,45 +1173,67 @@ def fetch_all_news():
     ]
     total_sources = len(RSS_SOURCES) + len(cn_fetchers)
     
-    print(f"\n🌐 开始抓取全球新闻 [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]")
+    print(f"\n🌐 开始抓取全球新闻 [{now.astimezone().strftime('%Y-%m-%d %H:%M:%S')}]")
     print(f"   共 {total_sources} 个源 ({len(RSS_SOURCES)} RSS + {len(cn_fetchers)} 国内热搜)\n")
     
     all_items = []
+    now_iso = now.isoformat()
+    feed_cache = load_feed_cache()
     
-    with ThreadPoolExecutor(max_workers=8) as executor:
+    # 每个源一个线程，总耗时取决于最慢的源，而不是分批排队
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, total_sources)) as executor:
         # RSS sources
-        futures = {executor.submit(fetch_single_rss, src): src['name'] for src in RSS_SOURCES}
+        futures = {executor.submit(fetch_single_rss, src, now_iso, feed_cache): src['name'] for src in RSS_SOURCES}
         # 国内热搜平台
         for name, func in cn_fetchers:
-            futures[executor.submit(func)] = name
+            futures[executor.submit(func, now_iso)] = name
         
         for future in as_completed(futures):
             items = future.result()
             all_items.extend(items)
     
+    save_feed_cache(feed_cache)
+    
     # 去重（按标题相似度）
+    # 先用完整标题的精确键挡掉相同标题，再用 SimHash 挡掉只差标点/个别字词的近重复；
+    # 不再按前 30 字符截断，前缀相同的不同新闻不会被误合并
     seen_titles = set()
+    index = SimHashIndex()
     unique_items = []
     for item in all_items:
-        # 简单去重：标题前30字符
-        title_key = re.sub(r'\s+', '', item['title'][:30]).lower()
-        if title_key not in seen_titles:
-            seen_titles.add(title_key)
-            unique_items.append(item)
+        title_key = item['title'].translate(_WS_TRANS).lower()
+        if title_key in seen_titles:
+            continue
+        seen_titles.add(title_key)
+        h = simhash(title_key)
+        if index.has_near_dup(h):
+            continue
+        index.add(h)
+        unique_items.append(item)
     
     # 排序：重要性 × 优先级 × 时间
+    now_ts = now.timestamp()  # 整个排序共用同一个“当前时间”
+    
     def sort_key(item):
-        try:
-            dt = datetime.fromisoformat(item['pub_date'].replace('Z', '+00:00'))
-            hours_ago = (datetime.now(timezone.utc) - dt).total_seconds() / 3600
-        except:
-            hours_ago = 24
+        # 构建条目时已存好发布时间戳 _pub_ts，避免排序时反复解析日期字符串
+        pub_ts = item.get('_pub_ts')
+        if pub_ts is None:
+            try:
+                pub_date = item['pub_date']
+                if pub_date.endswith('Z'):
+                    pub_date = pub_date[:-1] + '+00:00'
+                pub_ts = datetime.fromisoformat(pub_date).timestamp()
+            except:
+                pub_ts = now_ts - 24 * 3600
+        hours_ago = (now_ts - pub_ts) / 3600
         
         # 综合分数：重要性高+源优先级高+越新越好
         return -(item['importance'] * 10 + (3 - item['priority']) * 5 - hours_ago * 0.5)
     
-    unique_items.sort(key=sort_key)
-    unique_items = unique_items[:MAX_NEWS]
+    # 只需要分数最高的 MAX_NEWS 条：堆选出前 N 条 (结果与整体排序后截断相同)
+    unique_items = heapq.nsmallest(MAX_NEWS, unique_items, key=sort_key)
+    for item in unique_items:
+        item.pop('_pub_ts', None)  # 排序专用字段，不写入 JSON
     
     # 翻译英文新闻
     unique_items = translate_items(unique_items)
@@ -860,46 +1249,67 @@ def fetch_all_news():
     
     return unique_items
 
-def save_news(items):
-    """保存为JSON"""
+def save_news(items, now=None):
+    """保存为JSON (now: 本轮的参考时间，默认当前时间)"""
+    now = now or datetime.now(timezone.utc)
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     
     # 合并历史数据（保留最近的）
     existing = []
     if OUTPUT_FILE.exists():
         try:
-            with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                existing = data.get('items', [])
+            data = json_loads(OUTPUT_FILE.read_bytes())
+            existing = data.get('items', [])
         except:
             pass
     
-    # 合并去重
-    existing_ids = {item['id'] for item in items}
+    # 合并去重：按 id 建字典，新抓取的优先，旧条目排在后面
+    merged = {item['id']: item for item in items}
+    # 旧记录可能还是 md5 格式的 ID：本轮重新抓到的同一条新闻按旧 ID 识别，避免重复
+    # (旧格式条目 7 天后全部过期，届时可删除)
+    legacy_ids = {legacy_make_id(item.get('title_original', item['title']), item['source']) for item in items}
     for old_item in existing:
-        if old_item['id'] not in existing_ids:
-            items.append(old_item)
-            existing_ids.add(old_item['id'])
+        if old_item['id'] not in legacy_ids:
+            merged.setdefault(old_item['id'], old_item)
     
     # 只保留7天内的
-    cutoff = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-    items = [i for i in items if i.get('pub_date', '') >= cutoff or i.get('fetch_time', '') >= cutoff]
+    cutoff = (now - timedelta(days=7)).isoformat()
+    items = [i for i in merged.values() if i.get('pub_date', '') >= cutoff or i.get('fetch_time', '') >= cutoff]
     items = items[:MAX_NEWS]
     
     output = {
-        'last_update': datetime.now(timezone.utc).isoformat(),
+        'last_update': now.isoformat(),
         'total': len(items),
         'sources': len(RSS_SOURCES),
         'items': items
     }
     
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    write_atomic(OUTPUT_FILE, json_dumps(output, indent=NEWS_DEBUG))
     
     print(f"\n💾 已保存 {len(items)} 条新闻到 {OUTPUT_FILE}")
 
 # ==================== 主程序 ====================
 
+def ensure_dependencies():
+    """检查并安装抓取所需的依赖"""
+    try:
+        import feedparser
+    except ImportError:
+        print("📦 安装 feedparser...")
+        os.system("pip3 install feedparser")
+    
+    try:
+        import requests
+    except ImportError:
+        print("📦 安装 requests...")
+        os.system("pip3 install requests")
+
+def main(now=None):
+    """执行一次完整的新闻抓取并保存 (now: 本轮的参考时间，抓取与保存共用)"""
+    now = now or datetime.now(timezone.utc)
+    items = fetch_all_news(now)
+    save_news(items, now)
+
 if __name__ == '__main__':
     import argparse
     import sys
@@ -920,28 +1330,24 @@ if __name__ == '__main__':
         _mod.TRANSLATE_MODEL = args.model
     
     # 安装依赖
-    try:
-        import feedparser
-    except ImportError:
-        print("📦 安装 feedparser...")
-        os.system("pip3 install feedparser")
-        import feedparser
-    
-    try:
-        import requests
-    except ImportError:
-        print("📦 安装 requests...")
-        os.system("pip3 install requests")
-        import requests
+    ensure_dependencies()
     
     if args.loop > 0:
         print(f"🔄 循环模式: 每 {args.loop} 分钟抓取一次 (Ctrl+C 退出)")
+        import gc
+        rounds = 0
         while True:
             try:
-                items = fetch_all_news()
-                save_news(items)
-                print(f"\n⏰ 下次抓取: {(datetime.now() + timedelta(minutes=args.loop)).strftime('%H:%M:%S')}")
-                time.sleep(args.loop * 60)
+                # 每轮只取一次当前时间：抓取、保存、下次抓取时间都以它为准
+                now = datetime.now(timezone.utc)
+                next_run = now + timedelta(minutes=args.loop)
+                main(now)
+                rounds += 1
+                if rounds % LOOP_GC_ROUNDS == 0:
+                    gc.collect()
+                print(f"\n⏰ 下次抓取: {next_run.astimezone().strftime('%H:%M:%S')}")
+                # 按固定节奏抓取：扣掉本轮耗时
+                time.sleep(max(0, (next_run - datetime.now(timezone.utc)).total_seconds()))
             except KeyboardInterrupt:
                 print("\n👋 已停止")
                 break
@@ -950,6 +1356,5 @@ if __name__ == '__main__':
                 traceback.print_exc()
                 time.sleep(60)
     else:
-        items = fetch_all_news()
-        save_news(items)
+        main()
         print("\n✅ 完成!")
@@ -38,6 +38,7 @@ Raw Text → 清洗 → 分词(jieba) → 停用词过滤 → 实体识别
    → λ = ln(2) / half_life_hours (默认半衰期4小时)
 """
 
+import os
 import json
 import math
 import re
@@ -50,6 +51,11 @@ from pathlib import Path
 from typing import List, Dict, Tuple, Optional, Set
 from dataclasses import dataclass, field, asdict
 
+try:
+    import redis  # 可选: 设置 TREND_REDIS_URL 后用 RedisTimeSeries 存储关键词时间序列
+except ImportError:
+    redis = None
+
 logger = logging.getLogger('trend_engine')
 
 # ==================== 配置 ====================
@@ -76,6 +82,12 @@ HISTORY_WINDOWS = 144      # 保留历史窗口数 (144 × 10min = 24h)
 # 数据路径
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# RedisTimeSeries 地址 (如 redis://127.0.0.1:6379/0)，为空时使用 keyword_history.json
+TREND_REDIS_URL = os.environ.get('TREND_REDIS_URL', '')
+
+# jieba 并行分词进程数 (0 = 单进程, 通过 enable_parallel_tokenize 设置)
+JIEBA_PARALLEL_WORKERS = 0
+
 
 # ==================== 中文 NLP 停用词表 ====================
 STOPWORDS = set("""
@@ -148,6 +160,23 @@ class TrendTopic:
 
 
 # ==================== NLP 文本处理器 ====================
+def enable_parallel_tokenize(workers: int):
+    """
+    启用 jieba 多进程并行分词 (仅限 fork 启动方式)
+    
+    需在创建 ChineseNLP / TrendEngine 之前调用，进程池在自定义词典加载后创建。
+    子进程靠 fork 继承已加入的自定义词汇；spawn / forkserver (macOS、Python 3.14+ 的 Linux 默认)
+    下子进程会重新导入不含自定义词典的 jieba，分词结果悄然改变，因此保持单进程。
+    """
+    global JIEBA_PARALLEL_WORKERS
+    import multiprocessing
+    start_method = multiprocessing.get_start_method()
+    if start_method != 'fork':
+        logger.warning(f"  ⚠️ jieba 并行分词需要 fork 启动方式 (当前: {start_method})，保持单进程")
+        return
+    JIEBA_PARALLEL_WORKERS = workers
+
+
 class ChineseNLP:
     """
     中文 NLP 处理流水线
@@ -186,6 +215,11 @@ class ChineseNLP:
             for word in custom_words:
                 jieba.add_word(word, freq=10000)
             
+            # 并行模式在自定义词典加载之后再 fork 子进程，否则子进程看不到新增词汇
+            if JIEBA_PARALLEL_WORKERS > 1 and jieba.pool is None:
+                jieba.enable_parallel(JIEBA_PARALLEL_WORKERS)
+                logger.info(f"  ⚡ jieba 并行分词已启用 ({JIEBA_PARALLEL_WORKERS} 进程)")
+            
             logger.info("  ✅ jieba 分词器初始化完成")
         except ImportError:
             logger.warning("  ⚠️ jieba 未安装，将自动安装...")
@@ -236,7 +270,26 @@ class ChineseNLP:
         if not text:
             return []
         
-        words = self.jieba.cut(text, cut_all=False)
+        return self._filter_words(self.jieba.cut(text, cut_all=False), min_len)
+
+    def tokenize_batch(self, texts: List[str], min_len: int = 2) -> List[List[str]]:
+        """
+        批量分词，结果与逐条调用 tokenize 相同
+        
+        清洗后的文本不含换行，按行拼接后只调用一次 jieba.cut，
+        并行模式下 jieba 会按行把整批文本分发到各个子进程。
+        """
+        results = [[]]
+        for word in self.jieba.cut('\n'.join(self.clean_text(t) for t in texts), cut_all=False):
+            if word == '\n':
+                results.append([])
+            else:
+                results[-1].append(word)
+        return [self._filter_words(words, min_len) for words in results]
+
+    @staticmethod
+    def _filter_words(words, min_len: int) -> List[str]:
+        """去除停用词、短词和纯数字"""
         result = []
         for word in words:
             word = word.strip()
@@ -484,6 +537,10 @@ class TimeSeriesStore:
         if len(rec['windows']) > HISTORY_WINDOWS:
             rec['windows'] = rec['windows'][-HISTORY_WINDOWS:]
 
+    def prefetch(self, keywords):
+        """批量预取关键词数据 (数据已在内存中，无需操作)"""
+        pass
+
     def get_series(self, keyword: str) -> List[Dict]:
         """获取关键词的时间序列"""
         return self.data.get(keyword, {}).get('windows', [])
@@ -492,6 +549,10 @@ class TimeSeriesStore:
         """获取关键词的计数序列"""
         return [w['count'] for w in self.get_series(keyword)]
 
+    def get_meta(self, keyword: str) -> Dict:
+        """获取关键词的首次出现/峰值信息"""
+        return self.data.get(keyword, {})
+
     def cleanup(self, max_age_hours: int = 48):
         """清理过期数据"""
         cutoff = (datetime.now(timezone.utc) - timedelta(hours=max_age_hours)).isoformat()
@@ -513,6 +574,166 @@ class TimeSeriesStore:
             logger.info(f"  🧹 清理 {len(to_delete)} 个过期关键词")
 
 
+class RedisTimeSeriesStore:
+    """
+    基于 RedisTimeSeries 的关键词时间序列存储 (接口同 TimeSeriesStore)
+    
+    每个关键词的计数写入 TS 键 kw:{keyword}，只追加、不再整份重写；
+    首次出现/峰值信息存放在哈希 kw:meta:{keyword}。
+    过期由 TS 保留期和哈希 TTL 在服务端完成，cleanup 无需扫描。
+    """
+    
+    RETENTION_MS = HISTORY_WINDOWS * WINDOW_SIZE_MINUTES * 60 * 1000  # 24h
+    META_TTL_SECONDS = 48 * 3600
+    
+    # 仅当计数超过已记录峰值时更新峰值 (单次往返完成比较和写入)
+    _PEAK_SCRIPT = """
+    local peak = tonumber(redis.call('HGET', KEYS[1], 'peak_count') or '0')
+    if tonumber(ARGV[1]) > peak then
+        redis.call('HSET', KEYS[1], 'peak_count', ARGV[1], 'peak_time', ARGV[2])
+    end
+    """
+    
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.client.ping()
+        self.ts = self.client.ts()
+        self._check_module()
+        self._update_peak = self.client.register_script(self._PEAK_SCRIPT)
+        self._pipe = None
+        self._recorded = 0
+        # prefetch 批量读取的结果 (keyword → 时间序列 / 元信息)，有新写入时作废
+        self._series_cache: Dict[str, List[Dict]] = {}
+        self._meta_cache: Dict[str, Dict] = {}
+        logger.info(f"  📂 使用 RedisTimeSeries 存储历史数据: {url}")
+
+    def _check_module(self):
+        """
+        确认服务端加载了 TimeSeries 模块
+        
+        PING 只能说明 Redis 可达；普通 Redis 上 TS.* 命令会在首次写入时才报错。
+        用 TS.INFO 查询一个不存在的键：有模块时报"键不存在"，没有时报"未知命令"
+        """
+        try:
+            self.ts.info('kw:__probe__')
+        except redis.ResponseError as e:
+            if 'unknown command' in str(e).lower():
+                raise redis.ResponseError(f"未加载 TimeSeries 模块: {e}") from e
+
+    def _flush(self):
+        """提交尚未发送的写入"""
+        if self._pipe is not None:
+            self._pipe.execute()
+            self._pipe = None
+
+    def save(self):
+        """提交本轮写入 (数据已在服务端持久化)"""
+        self._flush()
+        logger.info(f"  💾 保存历史数据: {self._recorded} 个关键词")
+        self._recorded = 0
+
+    def record(self, keyword: str, count: int, platforms: List[str],
+               engagement: float = 0, window_time: str = None):
+        """
+        记录一个关键词在当前窗口的数据 (写入在首次读取或 save 时批量提交)
+        """
+        now = window_time or datetime.now(timezone.utc).isoformat()
+        ts_ms = int(datetime.fromisoformat(now.replace('Z', '+00:00')).timestamp() * 1000)
+        meta_key = f"kw:meta:{keyword}"
+        
+        if self._pipe is None:
+            self._pipe = self.client.pipeline(transaction=False)
+            self._series_cache.clear()
+            self._meta_cache.clear()
+        pipe = self._pipe
+        pipe.ts().add(f"kw:{keyword}", ts_ms, count,
+                      retention_msecs=self.RETENTION_MS, duplicate_policy='last')
+        pipe.hsetnx(meta_key, 'first_seen', now)
+        self._update_peak(keys=[meta_key], args=[count, now], client=pipe)
+        pipe.expire(meta_key, self.META_TTL_SECONDS)
+        self._recorded += 1
+
+    @staticmethod
+    def _to_windows(samples) -> List[Dict]:
+        """TS.REVRANGE 结果 → 按时间升序的窗口列表"""
+        return [
+            {'time': datetime.fromtimestamp(t / 1000, tz=timezone.utc).isoformat(),
+             'count': int(float(v))}
+            for t, v in reversed(samples)
+        ]
+
+    @staticmethod
+    def _to_meta(meta: Dict) -> Dict:
+        if 'peak_count' in meta:
+            meta['peak_count'] = int(meta['peak_count'])
+        return meta
+
+    def prefetch(self, keywords):
+        """
+        批量读取关键词的时间序列与元信息 (一个 pipeline、一次往返)
+        
+        突发检测和打分会逐个关键词调用 get_series / get_meta，
+        先在这里一次取齐，避免每个关键词两次同步往返
+        """
+        self._flush()
+        keywords = list(keywords)
+        if not keywords:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for keyword in keywords:
+            pipe.ts().revrange(f"kw:{keyword}", '-', '+', count=HISTORY_WINDOWS)
+            pipe.hgetall(f"kw:meta:{keyword}")
+        results = pipe.execute(raise_on_error=False)
+        
+        for i, keyword in enumerate(keywords):
+            samples, meta = results[2 * i], results[2 * i + 1]
+            # 键不存在时 TS.REVRANGE 返回错误
+            self._series_cache[keyword] = [] if isinstance(samples, Exception) else self._to_windows(samples)
+            if not isinstance(meta, Exception):
+                self._meta_cache[keyword] = self._to_meta(meta)
+
+    def get_series(self, keyword: str) -> List[Dict]:
+        """获取关键词的时间序列 (最近 HISTORY_WINDOWS 个窗口, 按时间升序)"""
+        self._flush()
+        cached = self._series_cache.get(keyword)
+        if cached is not None:
+            return cached
+        try:
+            samples = self.ts.revrange(f"kw:{keyword}", '-', '+', count=HISTORY_WINDOWS)
+        except redis.ResponseError:  # 键不存在
+            return []
+        return self._to_windows(samples)
+
+    def get_counts(self, keyword: str) -> List[int]:
+        """获取关键词的计数序列"""
+        return [w['count'] for w in self.get_series(keyword)]
+
+    def get_meta(self, keyword: str) -> Dict:
+        """获取关键词的首次出现/峰值信息"""
+        self._flush()
+        cached = self._meta_cache.get(keyword)
+        if cached is not None:
+            return cached
+        return self._to_meta(self.client.hgetall(f"kw:meta:{keyword}"))
+
+    def cleanup(self, max_age_hours: int = 48):
+        """过期由 Redis 保留期/TTL 处理"""
+        pass
+
+
+def create_time_series_store():
+    """配置了 TREND_REDIS_URL 且 Redis 可用 (含 TimeSeries 模块) 时使用 RedisTimeSeries，否则回退到 JSON 文件"""
+    if TREND_REDIS_URL:
+        if redis is None:
+            logger.warning("  ⚠️ 已设置 TREND_REDIS_URL 但未安装 redis，使用 keyword_history.json")
+        else:
+            try:
+                return RedisTimeSeriesStore(TREND_REDIS_URL)
+            except redis.RedisError as e:
+                logger.warning(f"  ⚠️ Redis 不可用 ({str(e)[:60]})，使用 keyword_history.json")
+    return TimeSeriesStore()
+
+
 # ==================== 突发检测算法 ====================
 class BurstDetector:
     """
@@ -767,7 +988,7 @@ class TrendEngine:
     
     def __init__(self):
         self.nlp = ChineseNLP()
-        self.ts_store = TimeSeriesStore()
+        self.ts_store = create_time_series_store()
         self.burst_detector = BurstDetector()
         self.heat_scorer = HeatScorer()
 
@@ -786,7 +1007,16 @@ class TrendEngine:
             return []
         
         logger.info(f"\n🔬 趋势分析引擎启动 [{len(raw_contents)} 条内容]")
+        freq_stats = self.extract_stats(raw_contents)
+        return self.rank(freq_stats, topK=topK)
+
+    def extract_stats(self, raw_contents: list) -> Dict[str, Dict]:
+        """
+        Step 1-2: NLP 关键词提取 + 词频统计
         
+        结果只取决于输入内容，输入未变化时调用方可复用上一轮的结果，
+        直接交给 rank()
+        """
         # ── Step 1: NLP 关键词提取 ──
         logger.info("  📝 Step 1/5: NLP 关键词提取...")
         keyword_data = self._extract_all_keywords(raw_contents)
@@ -794,11 +1024,19 @@ class TrendEngine:
         
         # ── Step 2: 统计词频、来源、互动 ──
         logger.info("  📊 Step 2/5: 统计分析...")
-        freq_stats = self._compute_frequency_stats(keyword_data, raw_contents)
+        return self._compute_frequency_stats(keyword_data, raw_contents)
+
+    def rank(self, freq_stats: Dict[str, Dict], topK: int = 50) -> List[TrendTopic]:
+        """
+        Step 3-5: 记录本窗口计数 → 突发检测 → 热力值排序
         
+        每次调用都会写入一个时间窗口，复用上一轮词频时历史序列也不会缺窗口
+        """
         # ── Step 3: 更新时间序列 ──
         logger.info("  📈 Step 3/5: 更新时间序列...")
         self._update_time_series(freq_stats)
+        # 突发检测与打分要逐个关键词读取历史，先批量取齐 (Redis 存储时只需一次往返)
+        self.ts_store.prefetch(freq_stats.keys())
         
         # ── Step 4: 突发检测 ──
         logger.info("  🚨 Step 4/5: 突发检测...")
@@ -849,8 +1087,11 @@ class TrendEngine:
         combined_keywords = self.nlp.batch_extract_keywords(all_texts, topK=100)
         keyword_set = {kw for kw, _ in combined_keywords}
         
+        # 整批分词 (并行模式下由 jieba 分发到多个进程)
+        all_words = self.nlp.tokenize_batch(all_texts)
+        
         # 为每个内容项标记关键词
-        for item in raw_contents:
+        for item, words in zip(raw_contents, all_words):
             if isinstance(item, dict):
                 title = item.get('title', '')
                 platform = item.get('platform', '')
@@ -860,8 +1101,7 @@ class TrendEngine:
                 platform = item.platform
                 engagement = item.engagement_score()
             
-            # 分词并匹配关键词
-            words = self.nlp.tokenize(title)
+            # 匹配关键词
             for word in words:
                 # 必须在关键词集中或是有意义的长词（排除停用词）
                 if word.lower() in ALL_STOPWORDS:
@@ -1001,10 +1241,9 @@ class TrendEngine:
         
         for keyword, stats in freq_stats.items():
             burst = burst_results.get(keyword, {})
-            series = self.ts_store.get_series(keyword)
             
             # 计算距峰值时间
-            rec = self.ts_store.data.get(keyword, {})
+            rec = self.ts_store.get_meta(keyword)
             peak_time_str = rec.get('peak_time', '')
             hours_since_peak = 0
             if peak_time_str:
@@ -1120,8 +1359,9 @@ class TrendEngine:
 # 模块导出
 # ================================
 __all__ = [
-    'TrendTopic', 'ChineseNLP', 'TimeSeriesStore',
-    'BurstDetector', 'HeatScorer', 'TrendEngine',
+    'TrendTopic', 'ChineseNLP', 'TimeSeriesStore', 'RedisTimeSeriesStore',
+    'create_time_series_store', 'BurstDetector', 'HeatScorer', 'TrendEngine',
+    'enable_parallel_tokenize',
 ]
 
 if __name__ == '__main__':
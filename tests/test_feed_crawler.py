@@ -0,0 +1,71 @@
+"""
+feed_crawler 响应缓存测试
+
+运行: python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import feed_crawler
+from feed_crawler import BaseCrawler, RawContent, ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class CachedRequestTest(unittest.TestCase):
+    """同一进程内重复调用 cached_request (TTL 命中 / 304 复用)"""
+
+    URL = 'https://example.com/hot'
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache = ResponseCache(Path(tmp.name) / "response_cache.json")
+        patcher = mock.patch.object(feed_crawler, 'response_cache', cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.crawler = BaseCrawler('test')
+
+    @staticmethod
+    def parse(resp):
+        return [RawContent(platform='test', content_id='1', title='标题', text='正文',
+                           views=10, tags=['a'])]
+
+    def test_ttl_hit_returns_fresh_copies(self):
+        resp = FakeResponse(headers={'ETag': '"v1"'})
+        with mock.patch.object(self.crawler, 'safe_request', return_value=resp) as req:
+            first = self.crawler.cached_request(self.URL, self.parse, ttl=300)
+            first[0].extra['simhash'] = 123  # 模拟 _finalize 修改返回的条目
+            second = self.crawler.cached_request(self.URL, self.parse, ttl=300)
+
+        self.assertEqual(req.call_count, 1)
+        self.assertEqual(len(second), 1)
+        self.assertIsNot(second[0], first[0])
+        self.assertEqual(second[0].title, '标题')
+        self.assertEqual(second[0].tags, ['a'])
+        self.assertNotIn('simhash', second[0].extra)
+
+    def test_304_reuses_cached_items(self):
+        responses = [FakeResponse(headers={'ETag': '"v1"'}), FakeResponse(status_code=304)]
+        with mock.patch.object(self.crawler, 'safe_request', side_effect=responses) as req:
+            first = self.crawler.cached_request(self.URL, self.parse, ttl=0)
+            second = self.crawler.cached_request(self.URL, self.parse, ttl=0)
+
+        self.assertEqual(req.call_count, 2)
+        self.assertEqual(req.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        self.assertEqual([i.content_id for i in second], [i.content_id for i in first])
+        self.assertTrue(second[0].crawl_time)
+
+
+if __name__ == '__main__':
+    unittest.main()